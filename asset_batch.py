@@ -0,0 +1,205 @@
+#!/usr/bin/env python3
+"""
+Multi-brand batch generation for the asset engine.
+
+Every subdirectory of the brands directory is one brand (gym location) with
+its own logo and an optional brand.json:
+
+    brands/
+        kalamaria/
+            logo.png
+            brand.json    {"name": "GetFit Kalamaria",
+                           "sources": {"logo2": "logo-wide.png"},
+                           "groups": ["android-icons", "splash-logo2-layered"]}
+
+"sources" maps manifest source names to files in the brand directory; any
+source it does not name uses the brand's logo ("logo" in brand.json,
+logo.png by default). "groups" defaults to the manifest's default set.
+Every brand also gets the Play Store feature graphic variants of the
+manifest, drawn around its "playstore-logo" source, unless brand.json sets
+"feature_graphic": false.
+
+All brands are planned up front and their renders share one worker pool,
+so throughput scales with brands x targets. Each brand gets its own output
+tree below --output, e.g. build/brands/kalamaria/android/app/src/main/res.
+
+Usage:
+    python asset_batch.py [BRANDS_DIR] [--output DIR] [--jobs N] [--brand NAME ...]
+"""
+
+import argparse
+import copy
+import json
+import os
+import time
+
+from asset_engine import (MANIFEST_FILE, ManifestError, add_build_arguments, build_jobs, execute,
+                          load_manifest, plan, plan_layer_lists, print_plan, render_store, resolve_source,
+                          webp_format)
+from asset_trace import profiled
+from create_feature_graphic import GRAPHIC_SIZE, build_feature_graphics
+
+BRANDS_DIR = "brands"
+BRAND_CONFIG = "brand.json"
+DEFAULT_OUTPUT = os.path.join("build", "brands")
+
+
+class Brand:
+    """One brand directory and its configuration"""
+
+    def __init__(self, name, directory, config):
+        self.name = name
+        self.directory = directory
+        self.config = config
+
+    @property
+    def title(self):
+        return self.config.get("name", self.name)
+
+    def path(self, filename):
+        return os.path.join(self.directory, filename)
+
+    def manifest(self, manifest):
+        """Copy of the asset manifest with every source pointing into this brand"""
+        manifest = copy.deepcopy(manifest)
+        logo = self.path(self.config.get("logo", "logo.png"))
+        overrides = self.config.get("sources", {})
+        for name in manifest["sources"]:
+            manifest["sources"][name] = self.path(overrides[name]) if name in overrides else logo
+        return manifest
+
+    def feature_graphic(self, manifest, output_root):
+        """(logo_path, output_dir, variants) of this brand's feature
+        graphics, None if brand.json turns them off"""
+        if not self.config.get("feature_graphic", True) or "feature_graphic" not in manifest:
+            return None
+        logo_path = resolve_source(manifest, "playstore-logo")
+        if logo_path is None:
+            raise ManifestError(f"Logo not found at {manifest['sources']['playstore-logo']}")
+        settings = manifest["feature_graphic"]
+        return logo_path, os.path.join(output_root, settings["output_dir"]), settings["variants"]
+
+
+def load_brands(brands_dir, names=None):
+    """Brands below brands_dir (only the given names if any), sorted by name"""
+    if not os.path.isdir(brands_dir):
+        raise ManifestError(f"Brands directory not found: {brands_dir}")
+
+    brands = []
+    for name in sorted(os.listdir(brands_dir)):
+        directory = os.path.join(brands_dir, name)
+        if not os.path.isdir(directory) or (names and name not in names):
+            continue
+        config = {}
+        config_path = os.path.join(directory, BRAND_CONFIG)
+        if os.path.exists(config_path):
+            try:
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            except ValueError as e:
+                raise ManifestError(f"Invalid {config_path}: {e}")
+        brands.append(Brand(name, directory, config))
+
+    missing = set(names or []) - {brand.name for brand in brands}
+    if missing:
+        raise ManifestError(f"Unknown brand(s): {', '.join(sorted(missing))}")
+    return brands
+
+
+def plan_brands(manifest, brands, output_root, low_memory=False, android_format=None):
+    """Render nodes, layer-lists and feature graphics of every brand, each
+    below its own tree; returns (nodes, layer_lists, graphics, brand of each
+    node's label and graphics output directory)"""
+    nodes, layer_lists, graphics, owners = [], [], [], {}
+    for brand in brands:
+        brand_manifest = brand.manifest(manifest)
+        group_names = brand.config.get("groups") or manifest["default"]
+        root = os.path.join(output_root, brand.name)
+        try:
+            brand_nodes = plan(brand_manifest, group_names, low_memory, android_format, root)
+            layer_lists += plan_layer_lists(brand_manifest, group_names, brand_nodes, root)
+            graphic = brand.feature_graphic(brand_manifest, root)
+        except ManifestError as e:
+            raise ManifestError(f"Brand '{brand.name}': {e}")
+        nodes += brand_nodes
+        owners.update((node.label, brand) for node in brand_nodes)
+
+        targets = sum(len(node.outputs) for node in brand_nodes)
+        if graphic is not None:
+            graphics.append(graphic)
+            owners[graphic[1]] = brand
+            targets += len(graphic[2])
+        print(f"  {brand.name:20} {targets:4} targets  {brand.title}")
+    return nodes, layer_lists, graphics, owners
+
+
+def graphic_outputs(graphics):
+    """(output_path, size) of every planned feature graphic"""
+    return [(os.path.join(output_dir, variant["output"]), GRAPHIC_SIZE)
+            for _, output_dir, variants in graphics for variant in variants.values()]
+
+
+def batch(brands_dir=BRANDS_DIR, output_root=DEFAULT_OUTPUT, brand_names=None, jobs=0, force=False,
+          low_memory=False, dry_run=False, tolerance=0, android_format=None, quality="release",
+          store=None, manifest_path=MANIFEST_FILE):
+    """Build the asset set of every brand through one shared worker pool
+    (dry_run, quality and store behave as in asset_engine.build)"""
+    manifest = load_manifest(manifest_path)
+    brands = load_brands(brands_dir, brand_names)
+    if not brands:
+        raise ManifestError(f"No brand directories in {brands_dir}")
+
+    print(f"Planning {len(brands)} brands:")
+    nodes, layer_lists, graphics, owners = plan_brands(manifest, brands, output_root, low_memory,
+                                                       android_format)
+    total = sum(len(node.outputs) for node in nodes) + len(layer_lists) + len(graphic_outputs(graphics))
+    print(f"Planned {total} targets, {len(nodes) + len(graphics)} unique renders\n")
+
+    if dry_run:
+        print_plan(nodes, layer_lists, force, graphic_outputs(graphics))
+        return []
+    if quality == "draft":
+        from asset_render import write_contact_sheet
+        write_contact_sheet(nodes, os.path.join(output_root, "contact-sheet.png"))
+        return []
+
+    def progress(done, count, entry):
+        brand = owners[entry["target"]]
+        target = os.path.relpath(entry["target"], os.path.join(output_root, brand.name))
+        print(f"[{done:{len(str(count))}}/{count}] {brand.name:20} {entry['seconds'] * 1000:7.1f} ms  {target}",
+              flush=True)
+
+    # Feature graphics are drawn on every build: a template per brand, its
+    # variants written only where the pixels changed
+    other_targets = [(output_dir, build_feature_graphics, (logo_path, output_dir, variants, tolerance))
+                     for logo_path, output_dir, variants in graphics]
+    start = time.perf_counter()
+    timings = execute(nodes, layer_lists, jobs, force, tolerance, progress=progress, verbose=False,
+                      store=store, other_targets=other_targets)
+    print(f"\n{len(brands)} brands built in {time.perf_counter() - start:.1f} s -> {output_root}")
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate icons, splash screens and feature graphics for every brand in a directory")
+    parser.add_argument("brands_dir", nargs="?", default=BRANDS_DIR,
+                        help=f"directory with one subdirectory per brand (default: {BRANDS_DIR})")
+    parser.add_argument("--output", default=DEFAULT_OUTPUT,
+                        help=f"root of the per-brand output trees (default: {DEFAULT_OUTPUT})")
+    parser.add_argument("--brand", action="append", dest="brands", help="only build this brand (repeatable)")
+    add_build_arguments(parser)
+    parser.set_defaults(jobs=0)
+    args = parser.parse_args()
+
+    try:
+        with profiled(args.profile):
+            batch(args.brands_dir, args.output, args.brands, jobs=build_jobs(args), force=args.force,
+                  low_memory=args.low_memory, dry_run=args.dry_run, tolerance=args.tolerance,
+                  android_format=webp_format(args), quality=args.quality, store=render_store(args))
+    except ManifestError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
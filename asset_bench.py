@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Benchmark for the asset generators.
+
+Runs every generator against synthetic logos of increasing resolution (from
+the 273x139 size of public/logo.png up to 4096x4096 masters) in a scratch
+directory, and records wall time, peak memory and output bytes per target.
+Results are compared with a JSON baseline; a generator that got slower or
+heavier than the tolerance allows is flagged as a regression.
+
+Usage:
+    python asset_bench.py                     # run and compare with the baseline
+    python asset_bench.py --update-baseline   # run and store a new baseline
+"""
+
+try:
+    from PIL import Image, ImageDraw
+    import PIL
+except ImportError:
+    print("Installing required package: Pillow")
+    import subprocess
+    subprocess.check_call(["pip", "install", "Pillow"])
+    from PIL import Image, ImageDraw
+    import PIL
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+import asset_engine
+import asset_master
+from asset_build import CACHE_DIR, peak_rss, reset_peak_rss
+
+BASELINE_PATH = os.path.join(CACHE_DIR, "bench-baseline.json")
+BASELINE_VERSION = 2
+
+# Logo resolutions, from the real public/logo.png up to large masters
+RESOLUTIONS = [(273, 139), (1024, 1024), (2048, 2048), (4096, 4096)]
+
+# Every logo the manifest and the scripts may read
+SOURCE_PATHS = [
+    "public/logo.png",
+    "public/logo2.png",
+    "public/logoapp.png",
+    "ios/App/App/public/logoapp.png",
+]
+
+# Generator scripts (and their --layered mode) and the manifest groups they build
+GENERATORS = {
+    "create_splash_screens": ["splash-logo"],
+    "create_splash_screens-layered": ["splash-logo-layered"],
+    "update_app_icons": ["android-icons", "ios-icons"],
+    "fix_app_icons": ["ios-icons-opaque"],
+    "create_playstore_icon": ["playstore-icon"],
+    "create_feature_graphic": None,
+}
+
+
+def synthetic_logo(size):
+    """Deterministic RGBA logo: colored shapes with soft edges on transparency"""
+    width, height = size
+    logo = Image.new('RGBA', size, (0, 0, 0, 0))
+    draw = ImageDraw.Draw(logo)
+    draw.ellipse([0, 0, height - 1, height - 1], fill=(0, 192, 139, 255))
+    draw.rounded_rectangle([height // 2, height // 4, width - 1, height * 3 // 4],
+                           radius=max(1, height // 8), fill=(26, 26, 26, 230))
+    draw.polygon([(width // 2, 0), (width - 1, height - 1), (width // 3, height - 1)],
+                 fill=(255, 107, 53, 160))
+    return logo
+
+
+def write_sources(size):
+    logo = synthetic_logo(size)
+    for path in SOURCE_PATHS:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        logo.save(path, 'PNG')
+
+
+def run_generator(name, groups, jobs):
+    """Run one generator from a cold master cache: (seconds, targets)"""
+    asset_master._masters.clear()
+    shutil.rmtree(asset_master.DECODED_CACHE_DIR, ignore_errors=True)
+
+    start = time.perf_counter()
+    if groups is None:
+        from create_feature_graphic import create_feature_graphic
+        output_path = "playstore-assets/graphics/feature-graphic-1024x500.png"
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+        reset_peak_rss()
+        target_start = time.perf_counter()
+        create_feature_graphic(SOURCE_PATHS[2], output_path)
+        targets = {output_path: {
+            "seconds": time.perf_counter() - target_start,
+            "peak_rss": peak_rss(),
+            "bytes": os.path.getsize(output_path),
+        }}
+    else:
+        results = asset_engine.build(groups, jobs=jobs, force=True)
+        targets = {entry["target"]: {
+            "seconds": entry["seconds"],
+            "peak_rss": entry["peak_rss"],
+            "bytes": entry["result"]["bytes"],
+        } for entry in results}
+    return time.perf_counter() - start, targets
+
+
+def summarize(seconds, targets):
+    rss = [target["peak_rss"] for target in targets.values() if target["peak_rss"] is not None]
+    return {
+        "seconds": seconds,
+        "peak_rss": max(rss) if rss else None,
+        "bytes": sum(target["bytes"] for target in targets.values()),
+        "targets": targets,
+    }
+
+
+def run_benchmarks(resolutions, generators, repeat, jobs):
+    """Fastest of `repeat` runs per (resolution, generator)"""
+    results = {}
+    cwd = os.getcwd()
+    workdir = tempfile.mkdtemp(prefix="asset-bench-")
+    try:
+        os.chdir(workdir)
+        for size in resolutions:
+            label = f"{size[0]}x{size[1]}"
+            write_sources(size)
+            results[label] = {}
+            for name in generators:
+                best = None
+                for _ in range(repeat):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        seconds, targets = run_generator(name, GENERATORS[name], jobs)
+                    if best is None or seconds < best[0]:
+                        best = (seconds, targets)
+                results[label][name] = summarize(*best)
+                entry = results[label][name]
+                print(f"  {label:>10}  {name:30} {entry['seconds'] * 1000:9.1f} ms"
+                      f"  {format_mb(entry['peak_rss']):>9}  {entry['bytes'] / 1024:9.1f} KB")
+    finally:
+        os.chdir(cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+    return results
+
+
+def format_mb(value):
+    return f"{value / 1024 / 1024:.1f} MB" if value is not None else "n/a"
+
+
+def compare(baseline, results, time_tolerance, size_tolerance):
+    """Regression messages for generators slower or heavier than the baseline"""
+    regressions = []
+    for label, generators in results.items():
+        for name, entry in generators.items():
+            old = baseline.get(label, {}).get(name)
+            if old is None:
+                continue
+            checks = [
+                ("wall time", old["seconds"], entry["seconds"], time_tolerance),
+                ("peak memory", old["peak_rss"], entry["peak_rss"], size_tolerance),
+                ("output bytes", old["bytes"], entry["bytes"], size_tolerance),
+            ]
+            for metric, before, after, tolerance in checks:
+                if before and after and after > before * (1 + tolerance):
+                    regressions.append(f"{label} {name}: {metric} {after / before - 1:+.0%} "
+                                       f"(allowed {tolerance:+.0%})")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the asset generators against a JSON baseline")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help=f"baseline file (default: {BASELINE_PATH})")
+    parser.add_argument("--update-baseline", action="store_true", help="store this run as the new baseline")
+    parser.add_argument("--generator", action="append", choices=list(GENERATORS),
+                        help="only benchmark this generator (repeatable)")
+    parser.add_argument("--max-resolution", type=int, default=4096,
+                        help="skip synthetic logos larger than this")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per benchmark, the fastest counts")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes per generator")
+    parser.add_argument("--time-tolerance", type=float, default=0.20,
+                        help="allowed wall time increase before flagging (default 0.20)")
+    parser.add_argument("--size-tolerance", type=float, default=0.10,
+                        help="allowed peak memory / output bytes increase (default 0.10)")
+    args = parser.parse_args()
+
+    resolutions = [size for size in RESOLUTIONS if max(size) <= args.max_resolution]
+    generators = args.generator or list(GENERATORS)
+    baseline_path = os.path.abspath(args.baseline)
+
+    print("Benchmarking asset generators...\n")
+    results = run_benchmarks(resolutions, generators, args.repeat, args.jobs)
+
+    if args.update_baseline:
+        os.makedirs(os.path.dirname(baseline_path), exist_ok=True)
+        with open(baseline_path, 'w', encoding='utf-8') as f:
+            json.dump({
+                "version": BASELINE_VERSION,
+                "python": platform.python_version(),
+                "pillow": PIL.__version__,
+                "machine": platform.machine(),
+                "results": results,
+            }, f, indent=2, sort_keys=True)
+        print(f"\nBaseline saved: {baseline_path}")
+        return
+
+    if not os.path.exists(baseline_path):
+        print(f"\nNo baseline at {baseline_path} (run with --update-baseline to create one)")
+        return
+
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    if baseline.get("version") != BASELINE_VERSION:
+        print(f"\nBaseline {baseline_path} has an unknown format, refresh it with --update-baseline")
+        return
+
+    regressions = compare(baseline["results"], results, args.time_tolerance, args.size_tolerance)
+    if regressions:
+        print("\nRegressions against the baseline:")
+        for message in regressions:
+            print(f"  - {message}")
+        sys.exit(1)
+    print("\nNo regressions against the baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Incremental build manifest for the icon/splash generators.
+
+Every generated file is recorded together with the hash of its source logo,
+the render parameters and the hash of the written output. A target is only
+rendered again when one of those changed or the output was touched.
+
+Out-of-date targets can be rendered on a process pool (--jobs N); outputs
+are written atomically and timings are reported in target order.
+"""
+
+import hashlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# Local build state (not committed)
+CACHE_DIR = ".asset-cache"
+MANIFEST_PATH = os.path.join(CACHE_DIR, "build-manifest.json")
+# Bump when the renderer changes its output for the same parameters
+MANIFEST_VERSION = 2
+
+# File hashes computed in this process, keyed by (path, mtime, size)
+_hashes = {}
+
+
+def file_hash(path):
+    """SHA-256 of a file, cached while the file stays untouched"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    digest = _hashes.get(key)
+    if digest is None:
+        sha = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(chunk)
+        digest = sha.hexdigest()
+        _hashes[key] = digest
+    return digest
+
+
+def atomic_write(data, output_path):
+    """Write bytes (or a list of byte chunks) through a temporary file
+    renamed over output_path"""
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            if isinstance(data, list):
+                f.writelines(data)
+            else:
+                f.write(data)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def resolve_jobs(jobs):
+    """Number of worker processes for a --jobs value (0 means one per CPU)"""
+    if not jobs or jobs < 0:
+        return os.cpu_count() or 1
+    return jobs
+
+
+def reset_peak_rss():
+    """Start a new peak-RSS measurement for this process (Linux only)"""
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+    except OSError:
+        pass
+
+
+def peak_rss():
+    """Peak resident memory of this process in bytes, None if unknown"""
+    try:
+        with open('/proc/self/status') as f:
+            for line in f:
+                if line.startswith('VmHWM:'):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    # ru_maxrss is in bytes on macOS and KB elsewhere; it cannot be reset
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return maxrss if sys.platform == 'darwin' else maxrss * 1024
+
+
+def _timed_call(func, args):
+    reset_peak_rss()
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, peak_rss(), result
+
+
+def iter_targets(targets, jobs=1):
+    """Run (output_path, func, args) targets, spread over a process pool when
+    jobs > 1, yielding (index, entry) as each target finishes; entry is a
+    dict (target, seconds, peak_rss, result). Closing the generator early
+    cancels the targets that have not started."""
+    targets = list(targets)
+    jobs = resolve_jobs(jobs)
+
+    def entry(index, timing):
+        seconds, rss, result = timing
+        return {"target": targets[index][0], "seconds": seconds, "peak_rss": rss, "result": result}
+
+    if jobs > 1 and len(targets) > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(targets))) as pool:
+            futures = {pool.submit(_timed_call, func, args): index
+                       for index, (_, func, args) in enumerate(targets)}
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], entry(futures[future], future.result())
+            finally:
+                for future in futures:
+                    future.cancel()
+    else:
+        for index, (_, func, args) in enumerate(targets):
+            yield index, entry(index, _timed_call(func, args))
+
+
+def run_targets(targets, jobs=1, progress=None):
+    """Run (output_path, func, args) targets, spread over a process pool when
+    jobs > 1. Returns one dict per target (target, seconds, peak_rss, result)
+    in the order of targets; progress(done, total, entry) is called as each
+    target finishes."""
+    targets = list(targets)
+    results = [None] * len(targets)
+    for done, (index, entry) in enumerate(iter_targets(targets, jobs), 1):
+        results[index] = entry
+        if progress is not None:
+            progress(done, len(targets), entry)
+    return results
+
+
+def print_timings(results):
+    """Per-target render times, peak memory and output size, in target order"""
+    if not results:
+        return
+    print("\nRender times:")
+    for entry in results:
+        rss = entry["peak_rss"]
+        detail = f"{rss / 1024 / 1024:7.1f} MB peak  " if rss is not None else ""
+        result = entry["result"]
+        if isinstance(result, dict) and "bytes" in result:
+            detail += f"{result['bytes'] / 1024:8.1f} KB  {result.get('strategy', ''):15}  "
+        print(f"  {entry['seconds'] * 1000:8.1f} ms  {detail}{entry['target']}")
+    print(f"  {sum(entry['seconds'] for entry in results) * 1000:8.1f} ms  total")
+
+
+class BuildManifest:
+    """Records what each output was built from and skips unchanged targets"""
+
+    def __init__(self, path=MANIFEST_PATH, force=False):
+        self.path = path
+        self.force = force
+        self.targets = {}
+        self.built = []
+        self.skipped = []
+        self._dirty = False
+
+        if os.path.exists(path):
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get('version') == MANIFEST_VERSION:
+                    self.targets = data.get('targets', {})
+            except (OSError, ValueError):
+                # Unreadable manifest just means a full rebuild
+                self.targets = {}
+
+    def is_current(self, output_path, source_path, params, metadata_only=False):
+        """True if output_path was built from the same source and params; with
+        metadata_only nothing is hashed, only recorded sizes and mtimes count"""
+        entry = self.targets.get(output_path)
+        if not entry or entry.get('params') != params:
+            return False
+        if entry.get('source') != source_path or not os.path.exists(output_path):
+            return False
+
+        if metadata_only:
+            source_stat = os.stat(source_path)
+            if (entry.get('source_size'), entry.get('source_mtime_ns')) != (source_stat.st_size, source_stat.st_mtime_ns):
+                return False
+        elif entry.get('source_hash') != file_hash(source_path):
+            return False
+        else:
+            # Source touched but unchanged: refresh what metadata checks compare
+            source_stat = os.stat(source_path)
+            if (entry.get('source_size'), entry.get('source_mtime_ns')) != (source_stat.st_size, source_stat.st_mtime_ns):
+                entry['source_size'] = source_stat.st_size
+                entry['source_mtime_ns'] = source_stat.st_mtime_ns
+                self._dirty = True
+
+        # Only re-hash the output when its metadata no longer matches
+        stat = os.stat(output_path)
+        if (entry.get('output_size'), entry.get('output_mtime_ns')) == (stat.st_size, stat.st_mtime_ns):
+            return True
+        return not metadata_only and entry.get('output_hash') == file_hash(output_path)
+
+    def record(self, output_path, source_path, params):
+        """Remember how output_path was just built"""
+        stat = os.stat(output_path)
+        source_stat = os.stat(source_path)
+        self.targets[output_path] = {
+            'source': source_path,
+            'source_hash': file_hash(source_path),
+            'source_size': source_stat.st_size,
+            'source_mtime_ns': source_stat.st_mtime_ns,
+            'params': params,
+            'output_hash': file_hash(output_path),
+            'output_size': stat.st_size,
+            'output_mtime_ns': stat.st_mtime_ns,
+        }
+        self._dirty = True
+
+    def stale_outputs(self, output_paths, source_path, params):
+        """Subset of output_paths that has to be rebuilt (all of them with force)"""
+        stale = []
+        for output_path in output_paths:
+            if not self.force and self.is_current(output_path, source_path, params):
+                self.skipped.append(output_path)
+            else:
+                stale.append(output_path)
+        return stale
+
+    def record_all(self, output_paths, source_path, params):
+        """Remember that output_paths were just built"""
+        for output_path in output_paths:
+            self.record(output_path, source_path, params)
+            self.built.append(output_path)
+
+    def save(self):
+        """Write the manifest back to disk if anything was rebuilt"""
+        if not self._dirty:
+            return
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'targets': self.targets}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+        self._dirty = False
+
+    def summary(self):
+        """One-line summary of the build"""
+        return f"{len(self.built)} rebuilt, {len(self.skipped)} up to date"
@@ -0,0 +1,361 @@
+#!/usr/bin/env python3
+"""
+Size-optimized PNG encoder for the asset generators.
+
+Each image can be encoded with several strategies (plain PNG, maximum
+compression, palette quantization). Palettes are tried from the fewest
+colors up and the first one within the error limits is kept, since a
+palette image is far smaller than its truecolor encoding; otherwise the
+smallest lossless encoding wins. No metadata chunks are written.
+
+The error is measured only over the pixels that differ from the
+background (a large flat background would otherwise hide damage to the
+logo), as an RMS limit (max_error) plus a bound on the worst pixels
+(max_peak). The background itself always keeps an exact palette entry.
+
+encode_webp() is the alternative for Android resources, lossless or lossy.
+
+pixels_match() compares two encodings by their decoded pixels, so an output
+whose bytes drifted without any visible change does not have to be rewritten.
+
+PNGStreamWriter encodes row bands as they are produced, for renders that
+should never hold their full frame in memory. Truecolor rows get the
+adaptive filter choice of libpng (the filter with the smallest sum of
+absolute differences), which needs only the previous row.
+"""
+
+try:
+    from PIL import Image, ImageChops
+    import io
+    import numpy as np
+    import struct
+    import zlib
+except ImportError:
+    print("Installing required packages: Pillow, numpy")
+    import subprocess
+    subprocess.check_call(["pip", "install", "Pillow", "numpy"])
+    from PIL import Image, ImageChops
+    import io
+    import numpy as np
+    import struct
+    import zlib
+
+from asset_trace import span
+
+# Strategies tried when the manifest does not configure any
+DEFAULT_STRATEGIES = ["png", "png-max", "palette-256", "palette-64", "palette-16"]
+
+# Largest accepted RMS error, in 8-bit levels (premultiplied for RGBA)
+DEFAULT_MAX_ERROR = 1.5
+
+# Largest accepted channel error of all but the worst PEAK_FRACTION of the
+# pixels (anti-aliased edges may go further), in 8-bit levels
+DEFAULT_MAX_PEAK = 16
+PEAK_FRACTION = 0.001
+
+# Quality of lossy WebP when the manifest does not set webp_quality
+DEFAULT_WEBP_QUALITY = 90
+
+# PNG save options of the lossless strategies
+LOSSLESS = {
+    "png": {"compress_level": 6},
+    "png-max": {"optimize": True},
+}
+
+
+def palette_colors(strategy):
+    """Number of colors of a palette-N strategy, None for lossless ones"""
+    if strategy.startswith("palette-"):
+        return int(strategy.split("-", 1)[1])
+    return None
+
+
+def _foreground(pixels, background=None):
+    """Mask of the pixels that are not background (for RGBA without one:
+    that are not fully transparent)"""
+    if background is not None:
+        return np.any(pixels[..., :len(background)] != np.asarray(background, dtype=pixels.dtype), axis=-1)
+    if pixels.shape[-1] == 4:
+        return pixels[..., 3] != 0
+    return np.ones(pixels.shape[:2], dtype=bool)
+
+
+def quantize(image, colors, background=None):
+    """Palette version of image without dithering (flat art compresses best).
+    With a background color, only the other pixels are quantized and the
+    background gets palette index 0 with its exact color"""
+    with span("quantize", image.width * image.height, colors=colors):
+        if background is None:
+            return image.quantize(colors, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+
+        pixels = np.asarray(image)
+        mask = _foreground(pixels, background)
+        indices = np.zeros(mask.shape, dtype=np.uint8)
+        palette = list(background)
+        if mask.any():
+            # One row of just the logo pixels: the background takes no colors from it
+            logo = Image.fromarray(np.ascontiguousarray(pixels[mask][np.newaxis]), image.mode)
+            reduced = logo.quantize(colors - 1, method=Image.Quantize.FASTOCTREE, dither=Image.Dither.NONE)
+            logo_indices = np.asarray(reduced)[0]
+            used = int(logo_indices.max()) + 1
+            palette += reduced.getpalette()[:used * 3]
+            indices[mask] = logo_indices + 1
+
+        candidate = Image.fromarray(indices, 'P')
+        candidate.putpalette(palette)
+        return candidate
+
+
+def _premultiplied(image):
+    pixels = np.asarray(image, dtype=np.int32)
+    if image.mode == 'RGBA':
+        alpha = pixels[..., 3:]
+        pixels = np.concatenate([pixels[..., :3] * alpha // 255, alpha], axis=-1)
+    return pixels
+
+
+def image_error(reference, candidate, background=None):
+    """(RMS, peak) difference between two images in 8-bit levels over the
+    pixels of reference that are not background; peak is the largest
+    channel error once the worst PEAK_FRACTION of those pixels is left out"""
+    with span("error", reference.width * reference.height):
+        return _image_error(reference, candidate, background)
+
+
+def _image_error(reference, candidate, background=None):
+    candidate = candidate.convert(reference.mode)
+
+    # Only the region that differs at all needs the per-pixel math
+    box = ImageChops.difference(reference, candidate).getbbox(alpha_only=False)
+    if box is None:
+        return 0.0, 0
+    count = int(np.count_nonzero(_foreground(np.asarray(reference), background)))
+    if count == 0:
+        # Nothing but background, and the background changed
+        count = reference.width * reference.height
+
+    crop = reference.crop(box)
+    diff = np.abs(_premultiplied(crop) - _premultiplied(candidate.crop(box)))
+    # A changed background pixel counts against the logo too
+    counted = _foreground(np.asarray(crop), background) | np.any(diff, axis=-1)
+    diff = diff[counted]
+    rms = float(np.sqrt(np.sum(diff * diff, dtype=np.int64) / (count * len(reference.getbands()))))
+
+    # Worst channel per pixel; everything outside the box is exact
+    histogram = np.bincount(diff.max(axis=-1), minlength=256)
+    histogram[0] += max(0, count - len(diff))
+    allowed = int(count * PEAK_FRACTION)
+    worse = np.cumsum(histogram[::-1])[::-1]
+    peak = int(np.argmax(np.append(worse[1:], 0) <= allowed))
+    return rms, peak
+
+
+def within_limits(error, max_error=DEFAULT_MAX_ERROR, max_peak=DEFAULT_MAX_PEAK):
+    """True if an image_error() result is within both limits"""
+    rms, peak = error
+    return rms <= max_error and peak <= max_peak
+
+
+# Rows compared at a time by pixels_match(), the strip height of the renderer
+COMPARE_ROWS = 64
+
+
+def _premultiplied_rows(image, top, bottom):
+    """Rows [top, bottom) of a decoded image as premultiplied RGBA int16"""
+    pixels = np.asarray(image.crop((0, top, image.width, bottom)).convert('RGBA'), dtype=np.uint16)
+    pixels[..., :3] = pixels[..., :3] * pixels[..., 3:] // 255
+    return pixels.astype(np.int16)
+
+
+def pixels_match(data, other, tolerance=0, rows=COMPARE_ROWS):
+    """True if two encoded images have the same size and no channel differs
+    by more than tolerance levels (premultiplied, so invisible color under
+    full transparency is ignored). Both stay decoded in their own 8-bit mode
+    and are compared a band of rows at a time, so a large frame never exists
+    as a full RGBA array"""
+    if data == other:
+        return True
+    try:
+        first, second = Image.open(io.BytesIO(data)), Image.open(io.BytesIO(other))
+        if first.size != second.size:
+            return False
+        first.load()
+        second.load()
+        for top in range(0, first.height, rows):
+            bottom = min(top + rows, first.height)
+            difference = _premultiplied_rows(first, top, bottom) - _premultiplied_rows(second, top, bottom)
+            if int(np.abs(difference).max()) > tolerance:
+                return False
+    except OSError:
+        # Unreadable existing file: treat it as different
+        return False
+    return True
+
+
+def _save(image, params):
+    # Drop any metadata the image picked up; keep the palette transparency
+    image.info = {key: value for key, value in image.info.items() if key == 'transparency'}
+    with span("encode", image.width * image.height, format="png") as record:
+        buffer = io.BytesIO()
+        image.save(buffer, 'PNG', **params)
+        record["bytes"] = buffer.tell()
+    return buffer.getvalue()
+
+
+def reduce_palette(image, strategies=None, max_error=DEFAULT_MAX_ERROR, max_peak=DEFAULT_MAX_PEAK,
+                   background=None):
+    """Fewest-colors palette version of image within the error limits: returns
+    (candidate, strategy, error), or None if no palette strategy is good enough"""
+    strategies = strategies or DEFAULT_STRATEGIES
+    palettes = sorted((s for s in strategies if palette_colors(s) is not None), key=palette_colors)
+
+    for strategy in palettes:
+        candidate = quantize(image, palette_colors(strategy), background)
+        error = image_error(image, candidate, background)
+        if within_limits(error, max_error, max_peak):
+            return candidate, strategy, error[0]
+    return None
+
+
+def encode_png(image, strategies=None, max_error=DEFAULT_MAX_ERROR, max_peak=DEFAULT_MAX_PEAK,
+               background=None):
+    """Smallest PNG encoding within the error limits: returns (data, strategy, error)"""
+    strategies = strategies or DEFAULT_STRATEGIES
+    reduced = reduce_palette(image, strategies, max_error, max_peak, background)
+    if reduced is not None:
+        candidate, strategy, error = reduced
+        return _save(candidate, LOSSLESS["png-max"]), strategy, error
+
+    best = None
+    for strategy in strategies:
+        if strategy in LOSSLESS:
+            data = _save(image, LOSSLESS[strategy])
+            if best is None or len(data) < len(best[0]):
+                best = (data, strategy, 0.0)
+
+    if best is None:
+        # Only palettes were configured and none was good enough
+        best = (_save(image, LOSSLESS["png"]), "png", 0.0)
+    return best
+
+
+def encode_webp(image, lossless=True, quality=DEFAULT_WEBP_QUALITY, background=None):
+    """WebP encoding of image: returns (data, strategy, error); lossless keeps
+    every pixel exact"""
+    if lossless:
+        # quality is compression effort here; method 6 is ~3x slower for <1% less
+        params = {"lossless": True, "quality": 100, "method": 4, "exact": True}
+        strategy = "webp"
+    else:
+        params = {"quality": quality, "alpha_quality": 100, "method": 6}
+        strategy = f"webp-q{quality}"
+
+    with span("encode", image.width * image.height, format="webp") as record:
+        buffer = io.BytesIO()
+        image.save(buffer, 'WEBP', **params)
+        record["bytes"] = buffer.tell()
+    data = buffer.getvalue()
+    error = 0.0
+    if not lossless:
+        error = image_error(image, Image.open(io.BytesIO(data)), background)[0]
+    return data, strategy, error
+
+
+def _chunk(kind, data):
+    return (struct.pack('>I', len(data)) + kind + data
+            + struct.pack('>I', zlib.crc32(kind + data) & 0xffffffff))
+
+
+def _paeth(left, up, up_left):
+    """PNG Paeth predictor, elementwise over int16 arrays"""
+    pa = np.abs(up - up_left)
+    pb = np.abs(left - up_left)
+    pc = np.abs(left + up - 2 * up_left)
+    return np.where((pa <= pb) & (pa <= pc), left, np.where(pb <= pc, up, up_left))
+
+
+def filter_rows(rows, prior, bytes_per_pixel):
+    """PNG scanlines of rows (uint8, one row per line) below prior (the
+    previous row, zeros above the first): each row gets the filter type with
+    the smallest sum of absolute differences, as a leading byte"""
+    x = rows.astype(np.int16)
+    up = np.vstack([prior[np.newaxis], rows[:-1]]).astype(np.int16)
+    left = np.zeros_like(x)
+    left[:, bytes_per_pixel:] = x[:, :-bytes_per_pixel]
+    up_left = np.zeros_like(x)
+    up_left[:, bytes_per_pixel:] = up[:, :-bytes_per_pixel]
+
+    # None, Sub, Up, Average, Paeth
+    predictions = [0, left, up, (left + up) // 2, _paeth(left, up, up_left)]
+    filtered = np.stack([(x - prediction) & 0xFF for prediction in predictions]).astype(np.uint8)
+    # Filtered bytes count as signed: 255 is as cheap as 1
+    cost = np.minimum(filtered, 256 - filtered.astype(np.int16)).sum(axis=2, dtype=np.int64)
+    choice = cost.argmin(axis=0)
+
+    lines = np.empty((len(rows), rows.shape[1] + 1), dtype=np.uint8)
+    lines[:, 0] = choice
+    lines[:, 1:] = filtered[choice, np.arange(len(rows))]
+    return lines.tobytes()
+
+
+class PNGStreamWriter:
+    """Streaming PNG encoder: raw rows are filtered and go straight into
+    zlib, so the full frame never has to exist in memory. Palette rows stay
+    unfiltered, which is what compresses them best."""
+
+    COLOR_TYPES = {'P': (3, 1), 'RGB': (2, 3), 'RGBA': (6, 4)}
+    IDAT_SIZE = 64 * 1024
+
+    def __init__(self, stream, size, mode, palette=None, level=9):
+        self.stream = stream
+        self.width, self.height = size
+        color_type, self.bytes_per_pixel = self.COLOR_TYPES[mode]
+        self.row_bytes = self.width * self.bytes_per_pixel
+        self.rows_written = 0
+        self.filtered = mode != 'P'
+        self._prior = np.zeros(self.row_bytes, dtype=np.uint8)
+        self._compressor = zlib.compressobj(level)
+        self._pending = bytearray()
+
+        stream.write(b'\x89PNG\r\n\x1a\n')
+        stream.write(_chunk(b'IHDR', struct.pack('>IIBBBBB', self.width, self.height, 8, color_type, 0, 0, 0)))
+        if mode == 'P':
+            stream.write(_chunk(b'PLTE', bytes(palette)))
+
+    def write_rows(self, data):
+        """Append one or more complete rows of raw pixel bytes"""
+        rows = np.frombuffer(data, dtype=np.uint8).reshape(-1, self.row_bytes)
+        if self.filtered:
+            lines = filter_rows(rows, self._prior, self.bytes_per_pixel)
+            self._prior = rows[-1].copy()
+        else:
+            # Filter type 0 (None) in front of every row
+            lines = np.hstack([np.zeros((len(rows), 1), dtype=np.uint8), rows]).tobytes()
+        self._pending += self._compressor.compress(lines)
+        self.rows_written += len(rows)
+        if len(self._pending) >= self.IDAT_SIZE:
+            self._flush()
+
+    def _flush(self):
+        if self._pending:
+            self.stream.write(_chunk(b'IDAT', bytes(self._pending)))
+            self._pending = bytearray()
+
+    def close(self):
+        if self.rows_written != self.height:
+            raise ValueError(f"PNG expects {self.height} rows, got {self.rows_written}")
+        self._pending += self._compressor.flush()
+        self._flush()
+        self.stream.write(_chunk(b'IEND', b''))
+
+
+def encode_png_rows(size, mode, bands, palette=None):
+    """PNG bytes from an iterable of raw row bands"""
+    with span("encode", size[0] * size[1], format="png-strips") as record:
+        buffer = io.BytesIO()
+        writer = PNGStreamWriter(buffer, size, mode, palette)
+        for band in bands:
+            writer.write_rows(band)
+        writer.close()
+        record["bytes"] = buffer.tell()
+    return buffer.getvalue()
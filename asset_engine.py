@@ -0,0 +1,588 @@
+#!/usr/bin/env python3
+"""
+Manifest-driven generator for app icons, splash screens and store icons.
+
+assets.manifest.json declares the source logos, the size tables and the
+groups of targets that used to be hard-coded in the individual scripts. The
+engine plans all requested targets as a graph of source -> render -> output
+paths, renders every unique (source, size, scale, background) combination
+once and fans the encoded bytes out to every destination. A group with a
+"layer_list" also writes an Android layer-list drawable (solid color under
+its per-density logo bitmap) in place of full-frame splash bitmaps.
+
+Usage:
+    python asset_engine.py [GROUP ...] [--jobs N] [--force] [--list] [--plan]
+                           [--quality draft|release] [--profile [FILE]]
+
+--plan (--dry-run) lists every target with its size and up-to-date status
+from file metadata alone; it never imports Pillow or decodes an image.
+--quality draft renders every target small, with cheap resampling, into
+.asset-cache/contact-sheet.png for review and leaves the outputs alone.
+Every build writes per-stage timing spans to .asset-cache/trace.jsonl and
+prints a stage summary; --profile additionally runs it under cProfile.
+"""
+
+import argparse
+import json
+import os
+import time
+
+from asset_build import BuildManifest, atomic_write, print_timings, run_targets
+from asset_trace import PROFILE_PATH, profiled
+from asset_trace import report as report_trace
+
+MANIFEST_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "assets.manifest.json")
+
+# Output formats and their file extensions
+FORMATS = {"png": ".png", "webp": ".webp", "webp-lossy": ".webp"}
+
+# Every extension an Android drawable resource can have
+RESOURCE_EXTENSIONS = (".png", ".webp", ".xml")
+
+LAYER_LIST_TEMPLATE = """<?xml version="1.0" encoding="utf-8"?>
+<!-- Generated by asset_engine.py from assets.manifest.json -->
+<layer-list xmlns:android="http://schemas.android.com/apk/res/android">
+    <item>
+        <color android:color="{color}" />
+    </item>
+    <item>
+        <bitmap android:gravity="center" android:src="@drawable/{bitmap}" />
+    </item>
+</layer-list>
+"""
+
+
+class ManifestError(Exception):
+    """Invalid asset manifest or conflicting target groups"""
+
+
+class RenderNode:
+    """One unique render and every output path that receives its bytes"""
+
+    def __init__(self, source, size, scale, background, encoder, budget=None, strips=False, format="png"):
+        self.source = source
+        self.size = size
+        self.scale = scale
+        self.background = background
+        self.encoder = encoder
+        self.budget = budget
+        self.format = format
+        # Strip rendering needs a solid background to fill around the logo,
+        # and only the PNG writer can stream
+        self.strips = strips and background is not None and format == "png"
+        self.outputs = []
+        self.stale = []
+
+    @property
+    def key(self):
+        background = tuple(self.background) if self.background is not None else None
+        strategies = self.encoder.get("strategies")
+        encoder = (tuple(strategies) if strategies else None, self.encoder.get("max_error"),
+                   self.encoder.get("max_peak"))
+        return (self.source, self.size, self.scale, background, encoder, self.strips, self.format)
+
+    @property
+    def mode(self):
+        return 'RGBA' if self.background is None else 'RGB'
+
+    @property
+    def params(self):
+        """Render parameters recorded in the build manifest"""
+        return {
+            "kind": "logo",
+            "size": list(self.size),
+            "scale": self.scale,
+            "background": self.background,
+            "format": "PNG" if self.format == "png" else self.format,
+            "mode": self.mode,
+            "encoder": self.encoder,
+            "render": "strips" if self.strips else "frame",
+        }
+
+    @property
+    def label(self):
+        if len(self.outputs) == 1:
+            return self.outputs[0]
+        return f"{self.outputs[0]} (+{len(self.outputs) - 1} copies)"
+
+
+class LayerList:
+    """Layer-list drawable: a solid color under a centered bitmap resource,
+    replacing the full-frame bitmaps of the same resource"""
+
+    def __init__(self, path, background, bitmap, replaces):
+        self.path = path
+        self.background = background
+        self.bitmap = bitmap
+        self.replaces = replaces
+
+    @property
+    def outputs(self):
+        return [self.path]
+
+    @property
+    def label(self):
+        return self.path
+
+    def xml(self):
+        color = "#" + "".join(f"{channel:02X}" for channel in self.background)
+        return LAYER_LIST_TEMPLATE.format(color=color, bitmap=self.bitmap).encode('utf-8')
+
+    def status(self):
+        """missing, stale or up to date"""
+        if not os.path.exists(self.path):
+            return "missing"
+        with open(self.path, 'rb') as f:
+            current = f.read() == self.xml()
+        if current and not any(os.path.exists(path) for path in self.replaced_paths()):
+            return "up to date"
+        return "stale"
+
+    def replaced_paths(self):
+        """Bitmap paths (existing or not) this drawable makes obsolete"""
+        return [path for replaced in self.replaces for path in [replaced] + twin_paths(replaced)
+                if path != self.path]
+
+
+def load_manifest(path=MANIFEST_FILE):
+    """Parsed assets manifest"""
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def resolve_source(manifest, name):
+    """Path of a named source; a list is a fallback chain, first existing wins"""
+    try:
+        candidates = manifest["sources"][name]
+    except KeyError:
+        raise ManifestError(f"Unknown source '{name}'")
+    if isinstance(candidates, str):
+        candidates = [candidates]
+    for candidate in candidates:
+        if os.path.exists(candidate):
+            return candidate
+    return None
+
+
+def group_outputs(manifest, group, output_root=None):
+    """(output_path, (width, height)) pairs declared by a group, below
+    output_root if given"""
+    for output in group["outputs"]:
+        table = output.get("sizes") or manifest["tables"][output["table"]]
+        for name, size in table.items():
+            if isinstance(size, int):
+                size = (size, size)
+            size = tuple(size)
+            directory = os.path.join(output_root or "", output["base"], name)
+            if "files" in output:
+                for filename in output["files"]:
+                    yield os.path.join(directory, filename), size
+            else:
+                yield directory, size
+
+
+def is_android_resource(path):
+    """True for files in an Android drawable-* or mipmap-* resource directory"""
+    return os.path.basename(os.path.dirname(path)).startswith(("drawable", "mipmap"))
+
+
+def resource_name(path):
+    """Path without extension: Android resources with the same name collide"""
+    return os.path.splitext(path)[0] if is_android_resource(path) else path
+
+
+def twin_paths(path):
+    """Other-format files of the same Android resource as path"""
+    if not is_android_resource(path):
+        return []
+    base, ext = os.path.splitext(path)
+    return [base + other for other in RESOURCE_EXTENSIONS if other != ext]
+
+
+def output_format(group, output_path, android_format=None):
+    """Format of one output: android_format overrides the group's own for
+    Android resources"""
+    format = group.get("format", "png")
+    if android_format and is_android_resource(output_path):
+        format = android_format
+    if format not in FORMATS:
+        raise ManifestError(f"Unknown output format '{format}'")
+    return format
+
+
+def group_encoder(manifest, group):
+    """Encoder settings of a group: its own "encoder" over the manifest's
+    (asset_encode defaults apply to anything neither of them sets)"""
+    encoder = dict(manifest.get("encoder", {}))
+    encoder.update(group.get("encoder", {}))
+    return encoder
+
+
+def plan(manifest, group_names, low_memory=False, android_format=None, output_root=None):
+    """Deduplicated render graph for the given groups: a list of RenderNode"""
+    nodes = {}
+    owners = {}
+
+    for group_name in group_names:
+        try:
+            group = manifest["groups"][group_name]
+        except KeyError:
+            raise ManifestError(f"Unknown group '{group_name}'")
+
+        source = resolve_source(manifest, group["source"])
+        if source is None:
+            candidates = manifest["sources"][group["source"]]
+            if isinstance(candidates, list):
+                candidates = ", ".join(candidates)
+            raise ManifestError(f"Logo not found at {candidates}")
+
+        encoder = group_encoder(manifest, group)
+        budget = group.get("budget")
+
+        for output_path, size in group_outputs(manifest, group, output_root):
+            format = output_format(group, output_path, android_format)
+            output_path = os.path.splitext(output_path)[0] + FORMATS[format]
+            node = RenderNode(source, size, group["scale"], group["background"], encoder, budget,
+                              low_memory, format)
+            node = nodes.setdefault(node.key, node)
+            if budget is not None and (node.budget is None or budget < node.budget):
+                node.budget = budget
+
+            owner = owners.get(resource_name(output_path))
+            if owner is not None and owner[1] is not node:
+                raise ManifestError(f"Groups '{owner[0]}' and '{group_name}' both write {output_path}")
+            if owner is None:
+                owners[resource_name(output_path)] = (group_name, node)
+                node.outputs.append(output_path)
+
+    return list(nodes.values())
+
+
+def plan_layer_lists(manifest, group_names, nodes, output_root=None):
+    """LayerList drawables of the given groups, checked against the planned
+    bitmap outputs"""
+    owners = {resource_name(path): node for node in nodes for path in node.outputs}
+    layer_lists = {}
+
+    for group_name in group_names:
+        spec = manifest["groups"][group_name].get("layer_list")
+        if spec is None:
+            continue
+        replaces = [path for path, _ in group_outputs(manifest, {"outputs": spec.get("replaces", [])}, output_root)]
+        path = os.path.join(output_root or "", spec["path"])
+        layer_list = LayerList(path, spec["background"], spec["bitmap"], replaces)
+
+        for path in [layer_list.path] + replaces:
+            if resource_name(path) in owners:
+                raise ManifestError(f"Group '{group_name}' writes a layer-list drawable over {path}, "
+                                    f"which another group renders as a bitmap")
+        other = layer_lists.get(layer_list.path)
+        if other is not None and other.xml() != layer_list.xml():
+            raise ManifestError(f"Two groups write different layer-lists to {layer_list.path}")
+        layer_lists[layer_list.path] = layer_list
+
+    return list(layer_lists.values())
+
+
+def write_layer_list(layer_list, verbose=True):
+    """Write a layer-list drawable and remove the bitmaps it replaces;
+    returns new, changed or unchanged"""
+    data = layer_list.xml()
+    status = "new"
+    if os.path.exists(layer_list.path):
+        with open(layer_list.path, 'rb') as f:
+            status = "unchanged" if f.read() == data else "changed"
+
+    if status != "unchanged":
+        os.makedirs(os.path.dirname(layer_list.path) or '.', exist_ok=True)
+        atomic_write(data, layer_list.path)
+    if verbose:
+        action = {"new": "Created", "changed": "Updated", "unchanged": "Unchanged"}[status]
+        print(f"{action}: {layer_list.path} (layer-list)")
+
+    for path in twin_paths(layer_list.path) + layer_list.replaced_paths():
+        if os.path.exists(path):
+            os.remove(path)
+            if verbose:
+                print(f"Removed: {path} (replaced by {os.path.basename(layer_list.path)})")
+    return status
+
+
+def output_sizes(nodes):
+    """Bytes on disk of every planned output that exists, including any
+    other-format twin of an Android resource that would still ship"""
+    sizes = {}
+    for node in nodes:
+        for output_path in node.outputs:
+            paths = [path for path in [output_path] + twin_paths(output_path) if os.path.exists(path)]
+            if paths:
+                sizes[output_path] = sum(os.path.getsize(path) for path in paths)
+    return sizes
+
+
+def print_size_report(nodes, before, after):
+    """Total shipped size before/after the build and assets over budget"""
+    total_before, total_after = sum(before.values()), sum(after.values())
+    change = f" ({(total_after - total_before) / total_before:+.0%})" if total_before else ""
+    print(f"Shipped size: {total_before / 1024:.1f} KB -> {total_after / 1024:.1f} KB{change}")
+
+    android = [path for node in nodes for path in node.outputs if is_android_resource(path)]
+    if android:
+        apk_before = sum(before.get(path, 0) for path in android)
+        apk_after = sum(after.get(path, 0) for path in android)
+        print(f"APK resources: {apk_before / 1024:.1f} KB -> {apk_after / 1024:.1f} KB "
+              f"({(apk_after - apk_before) / 1024:+.1f} KB)")
+
+    for node in nodes:
+        if node.budget is None:
+            continue
+        for output_path in node.outputs:
+            size = after.get(output_path, 0)
+            if size > node.budget:
+                print(f"Warning: {output_path} is {size / 1024:.1f} KB, "
+                      f"over its {node.budget / 1024:.1f} KB budget")
+
+
+def replaced_size(layer_lists):
+    """Bytes on disk of the bitmaps the layer-lists replace"""
+    return sum(os.path.getsize(path) for layer_list in layer_lists
+               for path in layer_list.replaced_paths() if os.path.exists(path))
+
+
+def output_status(build_manifest, node, output_path):
+    """"missing", "stale" or "up to date", judged from file metadata only"""
+    if not os.path.exists(output_path):
+        return "missing"
+    if build_manifest.is_current(output_path, node.source, node.params, metadata_only=True):
+        return "up to date"
+    return "stale"
+
+
+def print_plan(nodes, layer_lists=(), force=False, other_outputs=()):
+    """List every planned target without rendering anything; other_outputs
+    are (output_path, (width, height)) pairs rendered on every build"""
+    build_manifest = BuildManifest(force=force)
+    counts = {}
+    for layer_list in layer_lists:
+        status = layer_list.status()
+        counts[status] = counts.get(status, 0) + 1
+        print(f"  {status:10}  {'layer-list':9}  {layer_list.path}")
+    for node in nodes:
+        for output_path in node.outputs:
+            status = output_status(build_manifest, node, output_path)
+            if force and status == "up to date":
+                status = "stale"
+            counts[status] = counts.get(status, 0) + 1
+            print(f"  {status:10}  {node.size[0]:>4}x{node.size[1]:<4}  {output_path}")
+    for output_path, size in other_outputs:
+        status = "stale" if os.path.exists(output_path) else "missing"
+        counts[status] = counts.get(status, 0) + 1
+        print(f"  {status:10}  {size[0]:>4}x{size[1]:<4}  {output_path}")
+    print("\n" + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+
+def print_store_summary(store, timings):
+    """Render store hits of this build, after evicting down to the size cap"""
+    hits = sum(1 for entry in timings if entry["result"].get("cached"))
+    removed, freed = store.prune()
+    line = f"Render store: {hits} of {len(timings)} renders reused ({store.path})"
+    if removed:
+        line += f", evicted {removed} ({freed / 1024 / 1024:.1f} MB)"
+    print(line)
+
+
+def print_change_summary(timings, layer_list_changes=()):
+    """How many written outputs are new, changed or pixel-identical"""
+    counts = {"changed": 0, "unchanged": 0, "new": 0}
+    for entry in timings:
+        for status in entry["result"]["changes"].values():
+            counts[status] += 1
+    for status in layer_list_changes:
+        counts[status] += 1
+    print(", ".join(f"{count} {status}" for status, count in counts.items()))
+
+
+def build(group_names=None, jobs=1, force=False, low_memory=False, dry_run=False, tolerance=0,
+          android_format=None, quality="release", store=None, manifest_path=MANIFEST_FILE):
+    """Build the given groups (manifest default if None); returns the
+    per-target results of run_targets() for the targets that were rebuilt
+    (none with dry_run, which only lists the plan). Outputs whose pixels stay
+    within tolerance levels of the existing file are not rewritten.
+    android_format ("webp", "webp-lossy") overrides the format of every
+    Android drawable/mipmap target. quality "draft" writes no outputs, only a
+    contact sheet of quick preview renders. store is an optional RenderStore
+    checked before anything is rendered"""
+    manifest = load_manifest(manifest_path)
+    if not group_names:
+        group_names = manifest["default"]
+
+    nodes = plan(manifest, group_names, low_memory, android_format)
+    layer_lists = plan_layer_lists(manifest, group_names, nodes)
+    total = sum(len(node.outputs) for node in nodes) + len(layer_lists)
+    print(f"Planned {total} targets, {len(nodes)} unique renders")
+
+    if dry_run:
+        print_plan(nodes, layer_lists, force)
+        return []
+
+    if quality == "draft":
+        from asset_render import write_contact_sheet
+        start = time.perf_counter()
+        write_contact_sheet(nodes)
+        print(f"Draft preview in {(time.perf_counter() - start) * 1000:.0f} ms "
+              f"(nothing written to the app; build with --quality release)")
+        return []
+
+    return execute(nodes, layer_lists, jobs, force, tolerance, store=store)
+
+
+def execute(nodes, layer_lists=(), jobs=1, force=False, tolerance=0, progress=None, verbose=True,
+            store=None, other_targets=()):
+    """Render the stale outputs of planned nodes (through the RenderStore
+    if given), write the layer-lists and report; returns the run_targets()
+    results. other_targets are extra (label, func, args) targets run in the
+    same worker pool, e.g. the feature graphics of asset_batch."""
+    before = output_sizes(nodes)
+    before_replaced = replaced_size(layer_lists)
+    build_manifest = BuildManifest(force=force)
+    for node in nodes:
+        node.stale = build_manifest.stale_outputs(node.outputs, node.source, node.params)
+        for output_path in node.outputs:
+            if verbose and output_path not in node.stale:
+                print(f"Up to date: {output_path}")
+
+    targets = []
+    if any(node.stale for node in nodes):
+        # Pillow/NumPy are only imported once something has to be rendered
+        from asset_render import build_node
+        targets = [(node.label, build_node, (node, node.stale, tolerance, verbose, store))
+                   for node in nodes if node.stale]
+    targets += other_targets
+
+    timings = run_targets(targets, jobs, progress)
+    # Bitmaps first, so the drawable never points at a missing logo
+    layer_list_changes = [write_layer_list(layer_list, verbose) for layer_list in layer_lists]
+
+    for node in nodes:
+        build_manifest.record_all(node.stale, node.source, node.params)
+    build_manifest.save()
+
+    if verbose:
+        print_timings(timings)
+    print(f"\n{build_manifest.summary()}")
+    if store is not None:
+        print_store_summary(store, timings)
+    if timings or layer_list_changes:
+        print_change_summary(timings, layer_list_changes)
+    print_size_report(nodes, before, output_sizes(nodes))
+    if before_replaced:
+        print(f"Removed {before_replaced / 1024:.1f} KB of full-frame bitmaps replaced by layer-lists")
+    report_trace((entry["target"], entry["result"]["spans"]) for entry in timings)
+    return timings
+
+
+def add_build_arguments(parser):
+    """Build options shared by the engine and the wrapper scripts"""
+    parser.add_argument("--force", action="store_true",
+                        help="rebuild every target even if it is up to date")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="render on N worker processes (0 = one per CPU)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="encode solid-background targets in row strips instead of full frames")
+    parser.add_argument("--tolerance", type=int, default=0,
+                        help="rewrite an existing output only if a pixel differs by more than N levels")
+    parser.add_argument("--webp", nargs="?", const="lossless", choices=["lossless", "lossy"],
+                        help="write Android drawables and mipmaps as WebP (default lossless) "
+                             "and remove their PNG twins")
+    parser.add_argument("--quality", choices=["draft", "release"], default="release",
+                        help="draft: fast preview renders into one contact sheet instead of the outputs")
+    parser.add_argument("--store", metavar="DIR",
+                        help="render store directory (default: $ASSET_STORE or .asset-cache/renders)")
+    parser.add_argument("--store-size", type=int, default=256, metavar="MB",
+                        help="evict least recently used renders above this size (default: 256)")
+    parser.add_argument("--no-store", action="store_true",
+                        help="always render, never read or fill the render store")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_PATH, metavar="FILE",
+                        help=f"run under cProfile and write the stats (default: {PROFILE_PATH}); "
+                             "renders in this process, ignoring --jobs")
+    parser.add_argument("--plan", "--dry-run", dest="dry_run", action="store_true",
+                        help="list targets and their status without rendering (no image decoding)")
+
+
+def render_store(args):
+    """RenderStore selected by the --store options, None with --no-store"""
+    if args.no_store:
+        return None
+    from asset_store import RenderStore
+    return RenderStore(args.store, args.store_size * 1024 * 1024)
+
+
+def build_jobs(args):
+    """Worker count for --jobs, 1 with --profile so every render is profiled"""
+    return 1 if args.profile else args.jobs
+
+
+def webp_format(args):
+    """Output format selected by --webp, None to keep the manifest's"""
+    return {None: None, "lossless": "webp", "lossy": "webp-lossy"}[args.webp]
+
+
+def run(group_names, description=None, layered_groups=None):
+    """Entry point for the wrapper scripts: returns "built" once the outputs
+    are in place, "preview" if nothing was written to them (--dry-run,
+    --quality draft) and None on error. layered_groups are built instead of
+    group_names with --layered"""
+    parser = argparse.ArgumentParser(description=description)
+    add_build_arguments(parser)
+    if layered_groups:
+        parser.add_argument("--layered", action="store_true",
+                            help="write a layer-list drawable with per-density logo bitmaps; "
+                                 "removes the full-frame splash bitmaps")
+    args = parser.parse_args()
+    if getattr(args, "layered", False):
+        group_names = layered_groups
+
+    try:
+        with profiled(args.profile):
+            build(group_names, jobs=build_jobs(args), force=args.force, low_memory=args.low_memory,
+                  dry_run=args.dry_run, tolerance=args.tolerance,
+                  android_format=webp_format(args), quality=args.quality, store=render_store(args))
+    except ManifestError as e:
+        print(f"Error: {e}")
+        return None
+    if args.dry_run or args.quality == "draft":
+        return "preview"
+    return "built"
+
+
+def print_groups(manifest):
+    default = set(manifest["default"])
+    for name, group in manifest["groups"].items():
+        marker = "*" if name in default else " "
+        print(f" {marker} {name:20} {group.get('description', '')}")
+    print("\n(* = built when no group is given)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate app icons and splash screens from assets.manifest.json")
+    parser.add_argument("groups", nargs="*", help="groups to build (default: the manifest's default set)")
+    parser.add_argument("--list", action="store_true", help="list the available groups and exit")
+    add_build_arguments(parser)
+    args = parser.parse_args()
+
+    if args.list:
+        print_groups(load_manifest())
+        return
+
+    try:
+        with profiled(args.profile):
+            build(args.groups, jobs=build_jobs(args), force=args.force, low_memory=args.low_memory,
+                  dry_run=args.dry_run, tolerance=args.tolerance,
+                  android_format=webp_format(args), quality=args.quality, store=render_store(args))
+    except ManifestError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
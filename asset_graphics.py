@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Shared drawing helpers for the asset generators.
+
+Gradients are built as NumPy arrays in one step instead of one draw call per
+row, and layers are composited straight into the target canvas without
+full-frame temporary images.
+"""
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    import numpy as np
+except ImportError:
+    print("Installing required packages: Pillow, numpy")
+    import subprocess
+    subprocess.check_call(["pip", "install", "Pillow", "numpy"])
+    from PIL import Image, ImageDraw, ImageFont
+    import numpy as np
+
+from asset_trace import span
+
+# Contact sheet layout: thumbnail box, caption height and spacing (pixels)
+SHEET_CELL = 160
+SHEET_CAPTION = 28
+SHEET_MARGIN = 12
+
+
+def new_canvas(size, background=None):
+    """Transparent RGBA canvas, or opaque RGB canvas filled with background"""
+    with span("canvas", size[0] * size[1]):
+        if background is None:
+            return Image.new('RGBA', size, (0, 0, 0, 0))
+        return Image.new('RGB', size, tuple(background))
+
+
+def vertical_gradient(size, top, bottom):
+    """RGB image fading from the top color to the bottom color, row by row"""
+    with span("gradient", size[0] * size[1]):
+        return _vertical_gradient(size, top, bottom)
+
+
+def _vertical_gradient(size, top, bottom):
+    width, height = size
+    top = np.asarray(top, dtype=np.float64)
+    bottom = np.asarray(bottom, dtype=np.float64)
+
+    # Same per-row value as int(top + (y / height) * (bottom - top))
+    t = (np.arange(height, dtype=np.float64) / height)[:, None]
+    rows = (top + t * (bottom - top)).astype(np.uint8)
+
+    pixels = np.broadcast_to(rows[:, None, :], (height, width, 3))
+    return Image.fromarray(np.ascontiguousarray(pixels), 'RGB')
+
+
+def alpha_over(canvas, layer, position=(0, 0)):
+    """Composite an RGBA layer over canvas in place, touching only its region"""
+    with span("composite", layer.width * layer.height):
+        if layer.mode != 'RGBA':
+            canvas.paste(layer, position)
+        elif canvas.mode == 'RGBA':
+            canvas.alpha_composite(layer, dest=position)
+        else:
+            # Opaque canvas: pasting with the layer's own alpha is a full "over"
+            canvas.paste(layer, position, layer)
+    return canvas
+
+
+def centered(canvas_size, layer_size):
+    """Top-left position that centers layer_size inside canvas_size"""
+    return ((canvas_size[0] - layer_size[0]) // 2,
+            (canvas_size[1] - layer_size[1]) // 2)
+
+
+def checkerboard(size, square=8, light=(204, 204, 204), dark=(153, 153, 153)):
+    """RGB checkerboard that shows where a layer is transparent"""
+    width, height = size
+    y, x = np.indices((height, width))
+    cells = ((x // square + y // square) % 2).astype(bool)
+    pixels = np.where(cells[..., None], np.uint8(dark), np.uint8(light)).astype(np.uint8)
+    return Image.fromarray(pixels, 'RGB')
+
+
+def _fit_text(draw, text, font, width):
+    # Trim from the left: the end of a path is the informative part
+    if draw.textlength(text, font=font) <= width:
+        return text
+    while text and draw.textlength("..." + text, font=font) > width:
+        text = text[1:]
+    return "..." + text
+
+
+def contact_sheet(tiles, columns=8, background=(43, 43, 43)):
+    """One review image of (image, caption lines) tiles laid out in a grid;
+    images larger than a cell are shrunk, transparency shows as checkerboard"""
+    columns = max(1, min(columns, len(tiles)))
+    rows = (len(tiles) + columns - 1) // columns
+    pitch_x = SHEET_CELL + SHEET_MARGIN
+    pitch_y = SHEET_CELL + SHEET_CAPTION + SHEET_MARGIN
+    sheet = Image.new('RGB', (SHEET_MARGIN + columns * pitch_x, SHEET_MARGIN + rows * pitch_y), background)
+    draw = ImageDraw.Draw(sheet)
+    font = ImageFont.load_default()
+
+    for index, (image, captions) in enumerate(tiles):
+        left = SHEET_MARGIN + (index % columns) * pitch_x
+        top = SHEET_MARGIN + (index // columns) * pitch_y
+        if max(image.size) > SHEET_CELL:
+            factor = SHEET_CELL / max(image.size)
+            image = image.resize((max(1, round(image.width * factor)), max(1, round(image.height * factor))),
+                                 Image.Resampling.BILINEAR)
+        x, y = (left + (SHEET_CELL - image.width) // 2, top + (SHEET_CELL - image.height) // 2)
+        if image.mode == 'RGBA':
+            sheet.paste(checkerboard(image.size), (x, y))
+        alpha_over(sheet, image, (x, y))
+
+        for line, caption in enumerate(captions[:2]):
+            draw.text((left, top + SHEET_CELL + 2 + line * 13), _fit_text(draw, caption, font, SHEET_CELL),
+                      font=font, fill=(230, 230, 230))
+    return sheet
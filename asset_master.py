@@ -0,0 +1,239 @@
+#!/usr/bin/env python3
+"""
+Shared master image for the icon/splash generators.
+
+The logo is decoded and converted to RGBA once per process. Every requested
+size is then served from a cached pyramid of halved intermediate levels, so a
+full run costs one decode plus cheap cascaded resamples.
+
+Draft resizes (quick previews) take the smallest pyramid level that is still
+at least the target size and resample it with BILINEAR instead of LANCZOS.
+
+The decoded RGBA master and its pyramid levels are also kept on disk as raw
+pixel files keyed by the hash of the source logo (.asset-cache/masters).
+Pool workers and later runs memory-map them read-only instead of decoding
+the PNG again; editing a logo changes its hash, and the files of its
+previous version are removed when the new one is stored.
+"""
+
+try:
+    from PIL import Image
+    import hashlib
+    import mmap
+    import os
+    import struct
+    from collections import OrderedDict
+except ImportError:
+    print("Installing required package: Pillow")
+    import subprocess
+    subprocess.check_call(["pip", "install", "Pillow"])
+    from PIL import Image
+    import hashlib
+    import mmap
+    import os
+    import struct
+    from collections import OrderedDict
+
+from asset_build import CACHE_DIR, atomic_write, file_hash
+from asset_trace import span
+
+# Upper bound for cached pyramid levels and resized logos, per master (bytes)
+CACHE_MEMORY_LIMIT = 64 * 1024 * 1024
+
+# A pyramid level is only used as resample source while it is at least this
+# many times larger than the target, so LANCZOS still has enough detail
+MIN_OVERSAMPLE = 3
+
+# Decoded masters and pyramid levels shared across processes and runs
+DECODED_CACHE_DIR = os.path.join(CACHE_DIR, "masters")
+
+# Header of a decoded pixel file: magic, format version, width, height;
+# RGBA rows follow (the header size keeps them 16-byte aligned)
+DECODED_HEADER = struct.Struct('<4sIII')
+DECODED_MAGIC = b'RGBA'
+DECODED_VERSION = 1
+
+# Masters shared by every generator in this process, keyed by path
+_masters = {}
+
+
+def _image_bytes(image):
+    """Approximate in-memory size of an image"""
+    return image.width * image.height * len(image.getbands())
+
+
+class DecodedCache:
+    """Raw RGBA pixels of one source logo and its pyramid levels, stored
+    under the source hash and memory-mapped (zero-copy) on load"""
+
+    def __init__(self, source_path, directory=DECODED_CACHE_DIR):
+        self.directory = directory
+        # Files of one source path share a prefix, so an edited logo can
+        # drop the pixels of its previous version
+        self.prefix = hashlib.sha256(os.path.abspath(source_path).encode('utf-8')).hexdigest()[:16]
+        self.name = f"{self.prefix}-{file_hash(source_path)}"
+
+    def _path(self, depth):
+        return os.path.join(self.directory, f"{self.name}.{depth}.rgba")
+
+    def load(self, depth):
+        """Level depth (0 is the master) mapped from disk, or None"""
+        try:
+            with open(self._path(depth), 'rb') as f:
+                mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            # Missing (or empty) file
+            return None
+
+        magic, version, width, height = DECODED_HEADER.unpack_from(mapped)
+        if (magic != DECODED_MAGIC or version != DECODED_VERSION
+                or len(mapped) != DECODED_HEADER.size + width * height * 4):
+            mapped.close()
+            return None
+        with span("map", width * height):
+            pixels = memoryview(mapped)[DECODED_HEADER.size:]
+            return Image.frombuffer('RGBA', (width, height), pixels, 'raw', 'RGBA', 0, 1)
+
+    def store(self, depth, image):
+        """Persist an RGBA level; a read-only cache directory only costs speed"""
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            if depth == 0:
+                self._remove_previous()
+            header = DECODED_HEADER.pack(DECODED_MAGIC, DECODED_VERSION, image.width, image.height)
+            with span("persist", image.width * image.height) as record:
+                pixels = image.tobytes()
+                atomic_write([header, pixels], self._path(depth))
+                record["bytes"] = len(header) + len(pixels)
+        except OSError:
+            pass
+
+    def _remove_previous(self):
+        for entry in os.scandir(self.directory):
+            if entry.name.startswith(self.prefix + "-") and not entry.name.startswith(self.name + "."):
+                try:
+                    os.remove(entry.path)
+                except FileNotFoundError:
+                    pass
+
+
+class MasterImage:
+    """Logo decoded once, resized on demand through a bounded pyramid cache"""
+
+    def __init__(self, logo_path, memory_limit=CACHE_MEMORY_LIMIT, decoded_cache=None):
+        self.path = logo_path
+        self.decoded = decoded_cache
+        self.image = decoded_cache.load(0) if decoded_cache is not None else None
+        if self.image is None:
+            self.image = self._decode(logo_path)
+            if decoded_cache is not None:
+                decoded_cache.store(0, self.image)
+        self.width, self.height = self.image.size
+        self.memory_limit = memory_limit
+        self._cache = OrderedDict()
+        self._cache_bytes = 0
+
+    @staticmethod
+    def _decode(logo_path):
+        with span("decode") as record:
+            image = Image.open(logo_path)
+            image.load()
+            record["pixels"] = image.width * image.height
+        with span("convert", image.width * image.height):
+            return image.convert('RGBA')
+
+    @property
+    def ratio(self):
+        return self.width / self.height
+
+    def fit_size(self, logo_size):
+        """Size of the logo fitted into a logo_size square, keeping aspect ratio"""
+        if self.ratio > 1:
+            # Logo is wider
+            return logo_size, int(logo_size / self.ratio)
+        # Logo is taller or square
+        return int(logo_size * self.ratio), logo_size
+
+    def fit(self, logo_size, draft=False):
+        """Logo fitted into a logo_size square, keeping aspect ratio"""
+        return self.resize(self.fit_size(logo_size), draft)
+
+    def resize(self, size, draft=False):
+        """Logo resized to size with LANCZOS, or a cheaper draft resample
+        (cached, do not modify)"""
+        size = (max(1, size[0]), max(1, size[1]))
+        if size == self.image.size:
+            return self.image
+
+        key = ('draft' if draft else 'size', size)
+        cached = self._get(key)
+        if cached is None:
+            if draft:
+                source = self._level_for(size, 1)
+                with span("resize", size[0] * size[1], draft=True):
+                    cached = self._put(key, source.resize(size, Image.Resampling.BILINEAR))
+            else:
+                source = self._level_for(size)
+                with span("resize", size[0] * size[1]):
+                    cached = self._put(key, source.resize(size, Image.Resampling.LANCZOS))
+        return cached
+
+    def _level_for(self, size, oversample=MIN_OVERSAMPLE):
+        """Smallest pyramid level still oversample times larger than size"""
+        level = self.image
+        depth = 0
+        while (level.width // 2 >= size[0] * oversample
+               and level.height // 2 >= size[1] * oversample):
+            depth += 1
+            key = ('level', depth)
+            cached = self._get(key)
+            if cached is None and self.decoded is not None:
+                cached = self.decoded.load(depth)
+                if cached is not None:
+                    self._put(key, cached)
+            if cached is None:
+                # Each level is a cheap 2x box reduction of the previous one
+                with span("pyramid", level.width * level.height):
+                    cached = self._put(key, level.reduce(2))
+                if self.decoded is not None:
+                    self.decoded.store(depth, cached)
+            level = cached
+        return level
+
+    def _get(self, key):
+        image = self._cache.get(key)
+        if image is not None:
+            self._cache.move_to_end(key)
+        return image
+
+    def _put(self, key, image):
+        nbytes = _image_bytes(image)
+        if nbytes > self.memory_limit:
+            return image
+
+        self._cache[key] = image
+        self._cache_bytes += nbytes
+        # Evict least recently used entries until we are back under the limit
+        while self._cache_bytes > self.memory_limit:
+            _, evicted = self._cache.popitem(last=False)
+            self._cache_bytes -= _image_bytes(evicted)
+        return image
+
+    def clear(self):
+        """Drop every cached level and resized logo"""
+        self._cache.clear()
+        self._cache_bytes = 0
+
+
+def load_master(logo_path):
+    """Shared MasterImage for logo_path, reloaded when the file changes;
+    the decoded pixels come from the on-disk cache when it has them"""
+    stat = os.stat(logo_path)
+    key = os.path.abspath(logo_path)
+    stamp = (stat.st_mtime_ns, stat.st_size)
+
+    entry = _masters.get(key)
+    if entry is None or entry[0] != stamp:
+        entry = (stamp, MasterImage(logo_path, decoded_cache=DecodedCache(logo_path)))
+        _masters[key] = entry
+    return entry[1]
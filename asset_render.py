@@ -0,0 +1,208 @@
+#!/usr/bin/env python3
+"""
+Rendering half of asset_engine: turns a planned RenderNode into encoded
+bytes and writes them to its output paths.
+
+Kept apart from the planner so that listing and planning targets never
+imports Pillow or NumPy.
+"""
+
+import os
+
+from asset_build import CACHE_DIR, atomic_write
+from asset_encode import (DEFAULT_MAX_ERROR, DEFAULT_MAX_PEAK, DEFAULT_STRATEGIES, DEFAULT_WEBP_QUALITY,
+                          encode_png, encode_png_rows, encode_webp, image_error, palette_colors,
+                          pixels_match, quantize, within_limits)
+from asset_engine import twin_paths
+from asset_graphics import SHEET_CELL, alpha_over, centered, contact_sheet, new_canvas
+from asset_master import load_master
+from asset_trace import collect, span
+
+# Rows encoded per band in low-memory (strip) rendering
+STRIP_ROWS = 64
+
+# Where --quality draft writes its review image
+CONTACT_SHEET_PATH = os.path.join(CACHE_DIR, "contact-sheet.png")
+
+
+def render_logo(source, size, scale, background, draft=False):
+    """Logo centered on a canvas, scaled to a fraction of its shorter side"""
+    canvas = new_canvas(size, background)
+
+    # Resize logo maintaining aspect ratio (master is decoded once per run)
+    logo_size = int(min(size) * scale)
+    logo = load_master(source).fit(logo_size, draft)
+
+    # Composite logo centered, in a single pass
+    return alpha_over(canvas, logo, centered(size, logo.size))
+
+
+def _strip_bands(size, position, region, fill):
+    """Raw row bands of a frame that is fill everywhere except region"""
+    width, height = size
+    x, y = position
+    region_row = region.width * len(fill)
+    region_bytes = region.tobytes()
+    blank = fill * width
+    left, right = fill * x, fill * (width - x - region.width)
+
+    for top in range(0, height, STRIP_ROWS):
+        band = bytearray()
+        for row in range(top, min(top + STRIP_ROWS, height)):
+            if y <= row < y + region.height:
+                offset = (row - y) * region_row
+                band += left + region_bytes[offset:offset + region_row] + right
+            else:
+                band += blank
+        yield bytes(band)
+
+
+def encode_logo_strips(node):
+    """Encode a solid-background render band by band: only the logo region
+    is ever composited, the rest of the frame is background fill"""
+    logo = load_master(node.source).fit(int(min(node.size) * node.scale))
+    position = centered(node.size, logo.size)
+    region = alpha_over(new_canvas(logo.size, node.background), logo)
+    background = tuple(node.background)
+
+    strategies = node.encoder.get("strategies") or DEFAULT_STRATEGIES
+    palettes = sorted((s for s in strategies if palette_colors(s) is not None), key=palette_colors)
+    for strategy in palettes:
+        candidate = quantize(region, palette_colors(strategy), background)
+        # Outside the region the fill is exact and the error only counts
+        # logo pixels, so the region alone decides
+        error = image_error(region, candidate, background)
+        if not within_limits(error, node.encoder.get("max_error", DEFAULT_MAX_ERROR),
+                             node.encoder.get("max_peak", DEFAULT_MAX_PEAK)):
+            continue
+
+        # Index 0 is the exact background, inside the region and around it
+        used = candidate.getextrema()[1] + 1
+        palette = candidate.getpalette()[:used * 3]
+        bands = _strip_bands(node.size, position, candidate, bytes([0]))
+        return encode_png_rows(node.size, 'P', bands, palette), strategy, error[0]
+
+    bands = _strip_bands(node.size, position, region, bytes(background))
+    return encode_png_rows(node.size, 'RGB', bands), "png-strips", 0.0
+
+
+def write_output(data, output_path, tolerance=0):
+    """Write data unless output_path already holds the same pixels (within
+    tolerance levels); returns the status: new, changed or unchanged"""
+    if os.path.exists(output_path):
+        with span("compare") as record:
+            with open(output_path, 'rb') as f:
+                existing = f.read()
+            record["bytes"] = len(existing)
+            match = pixels_match(data, existing, tolerance, STRIP_ROWS)
+        if match:
+            # Leave the file (and its mtime) alone so nothing downstream rebuilds
+            return "unchanged"
+        status = "changed"
+    else:
+        os.makedirs(os.path.dirname(output_path) or '.', exist_ok=True)
+        status = "new"
+
+    with span("write", bytes=len(data)):
+        atomic_write(data, output_path)
+    return status
+
+
+def encode_node(node):
+    """Render and encode a node: returns (data, strategy, error)"""
+    if node.strips:
+        return encode_logo_strips(node)
+
+    image = render_logo(node.source, node.size, node.scale, node.background)
+    if node.format != "png":
+        return encode_webp(image, node.format == "webp",
+                           node.encoder.get("webp_quality", DEFAULT_WEBP_QUALITY), node.background)
+    return encode_png(image, node.encoder.get("strategies"),
+                      node.encoder.get("max_error", DEFAULT_MAX_ERROR),
+                      node.encoder.get("max_peak", DEFAULT_MAX_PEAK), node.background)
+
+
+def encoded_node(node, store=None):
+    """Encoded bytes of a node, from the render store when it has them:
+    returns (data, strategy, error, cached)"""
+    key = cached = None
+    if store is not None:
+        with span("store") as record:
+            key = store.key(node.source, node.params)
+            cached = store.get(key)
+            record["hit"] = cached is not None
+    if cached is not None:
+        data, info = cached
+        return data, info["strategy"], info["error"], True
+
+    data, strategy, error = encode_node(node)
+    if key is not None:
+        with span("store", bytes=len(data)):
+            store.put(key, data, {"strategy": strategy, "error": error})
+    return data, strategy, error, False
+
+
+def stream_node(node, encoded=True, store=None):
+    """Encoded bytes (or, with encoded False, the rendered image) of a node
+    and its metrics; nothing is written"""
+    # Only this target's stages (a pool worker may have run others before)
+    collect()
+    if not encoded:
+        image = render_logo(node.source, node.size, node.scale, node.background)
+        return image, {"pixels": image.width * image.height, "spans": collect()}
+
+    data, strategy, error, cached = encoded_node(node, store)
+    return data, {"bytes": len(data), "strategy": strategy, "error": error, "cached": cached,
+                  "spans": collect()}
+
+
+def build_node(node, output_paths, tolerance=0, verbose=True, store=None):
+    """Render once (or fetch the bytes from the render store), encode and
+    write the same bytes to every output path whose pixels differ from the
+    new render. The result carries the timing spans of every stage"""
+    # Only this target's stages (a pool worker may have run others before)
+    collect()
+    data, strategy, error, cached = encoded_node(node, store)
+
+    changes = {}
+    for output_path in output_paths:
+        status = changes[output_path] = write_output(data, output_path, tolerance)
+        if verbose and status == "unchanged":
+            print(f"Unchanged: {output_path} (same pixels, not rewritten)")
+        elif verbose:
+            action = "Created" if status == "new" else "Updated"
+            print(f"{action}: {output_path} ({len(data) / 1024:.1f} KB, {strategy})")
+
+        # Android rejects two resources of the same name in one directory
+        for twin in twin_paths(output_path):
+            if os.path.exists(twin):
+                os.remove(twin)
+                if verbose:
+                    print(f"Removed: {twin} (replaced by {os.path.basename(output_path)})")
+    return {"bytes": len(data), "strategy": strategy, "error": error, "changes": changes,
+            "cached": cached, "spans": collect()}
+
+
+def draft_tile(node):
+    """Draft render of a node, laid out at contact-sheet size: the frame is
+    scaled down as a whole, so proportions match the release render"""
+    factor = min(1.0, SHEET_CELL / max(node.size))
+    size = (max(1, round(node.size[0] * factor)), max(1, round(node.size[1] * factor)))
+    image = render_logo(node.source, size, node.scale, node.background, draft=True)
+
+    name = "/".join(node.outputs[0].replace(os.sep, "/").split("/")[-2:])
+    if len(node.outputs) > 1:
+        name += f" (+{len(node.outputs) - 1})"
+    return image, [f"{node.size[0]}x{node.size[1]}", name]
+
+
+def write_contact_sheet(nodes, path=CONTACT_SHEET_PATH):
+    """Draft-render every node into one contact sheet; nothing else is written"""
+    sheet = contact_sheet([draft_tile(node) for node in nodes])
+    data, _, _ = encode_png(sheet, ["png"])
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    atomic_write(data, path)
+    # Previews are not traced; drop their spans so watch mode does not pile them up
+    collect()
+    print(f"Contact sheet: {path} ({len(nodes)} renders, {sheet.width}x{sheet.height})")
+    return path
@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Content-addressed store of encoded renders.
+
+A render is a deterministic function of the source logo bytes and the render
+parameters (size, padding ratio, background, format, encoder settings), so
+its encoded bytes are stored under the SHA-256 of exactly that. Any checkout,
+branch or CI job that points at the same store directory gets the bytes
+back instead of rendering again.
+
+The store is capped in size: entries are touched on every hit and the least
+recently used ones are evicted after each build.
+"""
+
+import hashlib
+import json
+import os
+
+from asset_build import CACHE_DIR, atomic_write, file_hash
+
+# Bump when the renderer changes its output for the same parameters
+STORE_VERSION = 2
+
+DEFAULT_STORE_DIR = os.path.join(CACHE_DIR, "renders")
+DEFAULT_STORE_SIZE = 256 * 1024 * 1024
+
+# Environment override, e.g. a directory restored by the CI cache
+STORE_ENV = "ASSET_STORE"
+
+
+class RenderStore:
+    """Directory of encoded renders keyed by (source bytes, render params)"""
+
+    def __init__(self, path=None, max_bytes=DEFAULT_STORE_SIZE):
+        self.path = path or os.environ.get(STORE_ENV) or DEFAULT_STORE_DIR
+        self.max_bytes = max_bytes
+
+    def key(self, source_path, params):
+        """Store key of a render of source_path with params"""
+        identity = {"version": STORE_VERSION, "source": file_hash(source_path), "params": params}
+        return hashlib.sha256(json.dumps(identity, sort_keys=True).encode('utf-8')).hexdigest()
+
+    def _entry_path(self, key):
+        return os.path.join(self.path, key[:2], key)
+
+    def get(self, key):
+        """(data, info) stored under key, or None"""
+        entry_path = self._entry_path(key)
+        try:
+            with open(entry_path, 'rb') as f:
+                header, data = f.read().split(b'\n', 1)
+            info = json.loads(header)
+        except (OSError, ValueError):
+            return None
+        if info.get('bytes') != len(data):
+            # Truncated entry (interrupted copy of a CI cache)
+            return None
+        try:
+            # Mark as recently used for eviction
+            os.utime(entry_path)
+        except OSError:
+            pass
+        return data, info
+
+    def put(self, key, data, info):
+        """Store data with its JSON-able info (strategy, error, ...)"""
+        entry_path = self._entry_path(key)
+        os.makedirs(os.path.dirname(entry_path), exist_ok=True)
+        header = json.dumps(dict(info, bytes=len(data)), sort_keys=True).encode('utf-8')
+        atomic_write(header + b'\n' + data, entry_path)
+
+    def entries(self):
+        """(mtime, size, path) of every stored entry"""
+        entries = []
+        if not os.path.isdir(self.path):
+            return entries
+        for shard in os.scandir(self.path):
+            if not shard.is_dir():
+                continue
+            for entry in os.scandir(shard.path):
+                if entry.is_file() and not entry.name.endswith('.tmp'):
+                    stat = entry.stat()
+                    entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+        return entries
+
+    def prune(self):
+        """Evict least recently used entries until the store fits max_bytes;
+        returns (entries removed, bytes freed)"""
+        entries = sorted(self.entries())
+        total = sum(size for _, size, _ in entries)
+        removed = freed = 0
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                # Another build evicted it first
+                pass
+            total -= size
+            removed += 1
+            freed += size
+        return removed, freed
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+In-memory streaming API for the asset engine.
+
+stream() plans the requested groups like a build and yields every render
+as soon as it finishes, without touching the output tree:
+
+    from asset_stream import stream
+
+    for node, data, metrics in stream(["android-icons"], jobs=0):
+        for output_path in node.outputs:
+            archive.writestr(output_path, data)
+
+node is the planned RenderNode (outputs, size, format, params), data the
+encoded bytes, or a PIL image with encoded=False, and metrics holds the
+seconds, peak_rss, bytes, strategy and timing spans of the render. With
+encoded bytes the layer-list drawables of the groups follow last, as
+(LayerList, xml bytes, metrics); both kinds of spec have outputs and label.
+
+Run as a script it streams the groups straight into a zip archive:
+
+    python asset_stream.py [GROUP ...] --zip assets.zip [--jobs N]
+"""
+
+import argparse
+import os
+import zipfile
+
+from asset_build import iter_targets
+from asset_engine import MANIFEST_FILE, ManifestError, load_manifest, plan, plan_layer_lists
+
+
+def stream(group_names=None, jobs=1, encoded=True, low_memory=False, android_format=None, store=None,
+           manifest_path=MANIFEST_FILE):
+    """Yield (node, data or image, metrics) per render in completion order;
+    renders run on a process pool when jobs != 1 and are only started once
+    the generator is iterated"""
+    manifest = load_manifest(manifest_path)
+    if not group_names:
+        group_names = manifest["default"]
+    nodes = plan(manifest, group_names, low_memory, android_format)
+    layer_lists = plan_layer_lists(manifest, group_names, nodes) if encoded else []
+
+    # Pillow/NumPy are only imported once something has to be rendered
+    from asset_render import stream_node
+    targets = [(node.label, stream_node, (node, encoded, store)) for node in nodes]
+    for index, entry in iter_targets(targets, jobs):
+        payload, metrics = entry["result"]
+        yield nodes[index], payload, dict(metrics, seconds=entry["seconds"], peak_rss=entry["peak_rss"])
+
+    for layer_list in layer_lists:
+        data = layer_list.xml()
+        yield layer_list, data, {"seconds": 0.0, "peak_rss": None, "bytes": len(data), "spans": []}
+
+
+def stream_files(items):
+    """(output path, bytes) for every output of streamed encoded items"""
+    for spec, data, _ in items:
+        for output_path in spec.outputs:
+            yield output_path, data
+
+
+def write_zip(items, path):
+    """Write streamed encoded items into a zip archive at their output paths;
+    returns the number of files"""
+    count = 0
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        # PNG and WebP are already compressed
+        with zipfile.ZipFile(tmp_path, 'w', zipfile.ZIP_STORED) as archive:
+            for output_path, data in stream_files(items):
+                archive.writestr(output_path.replace(os.sep, "/"), data)
+                count += 1
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return count
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render asset groups in memory into a zip archive")
+    parser.add_argument("groups", nargs="*", help="groups to render (default: the manifest's default set)")
+    parser.add_argument("--zip", required=True, metavar="PATH", help="archive to write")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="render on N worker processes (0 = one per CPU)")
+    args = parser.parse_args()
+
+    def report(items):
+        for spec, data, metrics in items:
+            print(f"  {metrics['seconds'] * 1000:8.1f} ms  {len(data) / 1024:8.1f} KB  {spec.label}", flush=True)
+            yield spec, data, metrics
+
+    try:
+        count = write_zip(report(stream(args.groups, jobs=args.jobs)), args.zip)
+    except ManifestError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
+    print(f"\n{count} files -> {args.zip}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Per-stage timing spans for the asset generators.
+
+Rendering code wraps each stage (decode, convert, pyramid, resize,
+composite, quantize, encode, compare, write, ...) in span(). Spans are
+recorded in the process that ran them; build_node() collects them with its
+result, so they travel back from pool workers together with the target.
+
+A build writes every span as one JSON line to .asset-cache/trace.jsonl:
+
+    {"target": "...", "stage": "resize", "ms": 1.84, "pixels": 36864}
+
+and prints a per-stage summary table. profiled() wraps a whole run in
+cProfile for the function-level view.
+"""
+
+import json
+import os
+import time
+from contextlib import contextmanager
+
+from asset_build import CACHE_DIR
+
+TRACE_PATH = os.path.join(CACHE_DIR, "trace.jsonl")
+PROFILE_PATH = os.path.join(CACHE_DIR, "profile.pstats")
+
+# Functions listed after a --profile run
+PROFILE_TOP = 25
+
+# Spans recorded in this process since the last collect()
+_spans = []
+
+
+@contextmanager
+def span(stage, pixels=None, **fields):
+    """Time the enclosed block as one stage; the yielded record takes extra
+    fields such as bytes once they are known"""
+    record = {"stage": stage}
+    if pixels is not None:
+        record["pixels"] = pixels
+    record.update(fields)
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record["ms"] = round((time.perf_counter() - start) * 1000, 3)
+        _spans.append(record)
+
+
+def collect():
+    """Spans recorded in this process since the last call"""
+    spans = _spans[:]
+    del _spans[:]
+    return spans
+
+
+def write_trace(traced, path=TRACE_PATH):
+    """Write (target, spans) pairs as JSON lines, replacing the previous trace"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for target, spans in traced:
+            for record in spans:
+                f.write(json.dumps(dict(record, target=target), sort_keys=True) + "\n")
+    os.replace(tmp_path, path)
+
+
+def print_stage_summary(traced):
+    """Calls, time, pixels and bytes per stage, slowest stage first"""
+    stages = {}
+    for _, spans in traced:
+        for record in spans:
+            total = stages.setdefault(record["stage"], {"calls": 0, "ms": 0.0, "pixels": 0, "bytes": 0})
+            total["calls"] += 1
+            total["ms"] += record["ms"]
+            total["pixels"] += record.get("pixels", 0)
+            total["bytes"] += record.get("bytes", 0)
+    if not stages:
+        return
+
+    traced_ms = sum(total["ms"] for total in stages.values())
+    print("\nStages:")
+    print(f"  {'stage':12} {'calls':>6} {'ms':>10} {'share':>6} {'Mpixels':>9} {'KB':>9}")
+    for stage, total in sorted(stages.items(), key=lambda item: -item[1]["ms"]):
+        share = total["ms"] / traced_ms if traced_ms else 0
+        print(f"  {stage:12} {total['calls']:6} {total['ms']:10.1f} {share:6.0%} "
+              f"{total['pixels'] / 1e6:9.2f} {total['bytes'] / 1024:9.1f}")
+    print(f"  {'total':12} {'':6} {traced_ms:10.1f}")
+
+
+def report(traced, path=TRACE_PATH):
+    """Write the trace and print the stage summary"""
+    traced = [(target, spans) for target, spans in traced if spans]
+    if not traced:
+        return
+    write_trace(traced, path)
+    print_stage_summary(traced)
+    print(f"Trace: {path} ({sum(len(spans) for _, spans in traced)} spans)")
+
+
+@contextmanager
+def profiled(path=None):
+    """Run the enclosed block under cProfile when path is set: the stats are
+    written to path and the top functions by cumulative time printed"""
+    if not path:
+        yield
+        return
+
+    import cProfile
+    import pstats
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        profiler.dump_stats(path)
+        print(f"\nProfile: {path} (inspect with: python -m pstats {path})")
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(PROFILE_TOP)
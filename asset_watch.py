@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Watch mode for the asset engine.
+
+Follows the source logos of the requested groups (inotify on Linux, stat
+polling elsewhere) and rebuilds only the groups that depend on the file that
+changed. Fallback chains such as the Play Store logo watch every candidate,
+so adding or removing a preferred logo switches the source on the fly.
+
+Everything runs in this one long-lived process: decoded masters stay in
+memory between edits and only the edited logo is decoded again. Outputs are
+rendered exactly like a normal build, so the next asset_engine.py run finds
+them up to date. --low-memory encodes solid-background targets in row strips
+instead (recorded as a different render, so a normal build redoes them), and
+--quality draft only refreshes a contact sheet of quick previews.
+
+Usage:
+    python asset_watch.py [GROUP ...] [--low-memory] [--quality draft|release] [--interval SECONDS]
+"""
+
+import argparse
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import time
+
+from asset_engine import MANIFEST_FILE, ManifestError, build, load_manifest, resolve_source
+
+# inotify events that mean a file in a watched directory was (re)written,
+# replaced by an atomic rename, or removed
+IN_CLOSE_WRITE = 0x008
+IN_MOVED_FROM = 0x040
+IN_MOVED_TO = 0x080
+IN_CREATE = 0x100
+IN_DELETE = 0x200
+WATCH_MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+EVENT_HEADER = struct.Struct('iIII')
+
+# Editors save in several steps; changes this close together are one edit
+DEBOUNCE_SECONDS = 0.05
+
+# Stat interval of the polling fallback
+POLL_INTERVAL = 0.25
+
+
+class InotifyWatcher:
+    """Changed paths among a set of files, via inotify on their directories
+    (watching the directory also catches editors that save by renaming)"""
+
+    def __init__(self, paths):
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self.fd = libc.inotify_init1(os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+
+        self.paths = set(paths)
+        self.directories = {}
+        for directory in sorted({os.path.dirname(path) for path in self.paths}):
+            if not os.path.isdir(directory or '.'):
+                print(f"Warning: {directory} does not exist, not watching it")
+                continue
+            wd = libc.inotify_add_watch(self.fd, os.fsencode(directory or '.'), WATCH_MASK)
+            if wd < 0:
+                raise OSError(ctypes.get_errno(), f"Cannot watch {directory}")
+            self.directories[wd] = directory
+
+    def changes(self, timeout=None):
+        """Watched paths changed since the last call, waiting up to timeout
+        seconds (forever if None) for the first one"""
+        changed = set()
+        while select.select([self.fd], [], [], timeout)[0]:
+            data = os.read(self.fd, 64 * 1024)
+            offset = 0
+            while offset < len(data):
+                wd, _, _, length = EVENT_HEADER.unpack_from(data, offset)
+                offset += EVENT_HEADER.size
+                name = data[offset:offset + length].rstrip(b'\0')
+                offset += length
+                path = os.path.join(self.directories.get(wd, ''), os.fsdecode(name))
+                if path in self.paths:
+                    changed.add(path)
+            if changed:
+                break
+        return changed
+
+    def close(self):
+        os.close(self.fd)
+
+
+class PollingWatcher:
+    """Same interface as InotifyWatcher, comparing file metadata on a timer"""
+
+    def __init__(self, paths, interval=POLL_INTERVAL):
+        self.paths = set(paths)
+        self.interval = interval
+        self.stamps = {path: self._stamp(path) for path in self.paths}
+
+    @staticmethod
+    def _stamp(path):
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def changes(self, timeout=None):
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = set()
+            for path in self.paths:
+                stamp = self._stamp(path)
+                if stamp != self.stamps[path]:
+                    self.stamps[path] = stamp
+                    changed.add(path)
+            if changed or (deadline is not None and time.monotonic() >= deadline):
+                return changed
+            time.sleep(self.interval)
+
+    def close(self):
+        pass
+
+
+def open_watcher(paths, interval=POLL_INTERVAL):
+    """inotify watcher where the platform has it, polling otherwise"""
+    try:
+        return InotifyWatcher(paths)
+    except (OSError, AttributeError):
+        print("inotify is not available, polling the source files instead")
+        return PollingWatcher(paths, interval)
+
+
+def source_dependents(manifest, group_names):
+    """Every candidate source path of the groups -> names of the groups using it"""
+    dependents = {}
+    for group_name in group_names:
+        try:
+            group = manifest["groups"][group_name]
+            candidates = manifest["sources"][group["source"]]
+        except KeyError:
+            raise ManifestError(f"Unknown group or source for '{group_name}'")
+        if isinstance(candidates, str):
+            candidates = [candidates]
+        for candidate in candidates:
+            dependents.setdefault(os.path.normpath(candidate), []).append(group_name)
+    return dependents
+
+
+def affected_groups(manifest, group_names, changed):
+    """Groups (in requested order) whose rendered source may differ after the
+    changed paths; in a fallback chain only the active source and the
+    candidates in front of it matter"""
+    affected = []
+    for group_name in group_names:
+        name = manifest["groups"][group_name]["source"]
+        candidates = manifest["sources"][name]
+        if isinstance(candidates, str):
+            candidates = [candidates]
+        candidates = [os.path.normpath(candidate) for candidate in candidates]
+
+        active = resolve_source(manifest, name)
+        if active is not None:
+            candidates = candidates[:candidates.index(os.path.normpath(active)) + 1]
+        if changed.intersection(candidates):
+            affected.append(group_name)
+    return affected
+
+
+def rebuild(group_names, low_memory, quality, manifest_path):
+    """One incremental build; errors are reported, never fatal while watching"""
+    start = time.perf_counter()
+    try:
+        build(group_names, low_memory=low_memory, quality=quality, manifest_path=manifest_path)
+    except (ManifestError, OSError) as e:
+        # A half-written logo fails to decode; the next save triggers again
+        print(f"Error: {e}")
+        return
+    print(f"Rebuilt {', '.join(group_names)} in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+
+def watch(group_names=None, low_memory=False, interval=POLL_INTERVAL, quality="release",
+          manifest_path=MANIFEST_FILE):
+    """Build once, then rebuild the dependents of every changed source until interrupted"""
+    manifest = load_manifest(manifest_path)
+    group_names = group_names or manifest["default"]
+    dependents = source_dependents(manifest, group_names)
+
+    rebuild(group_names, low_memory, quality, manifest_path)
+
+    watcher = open_watcher(dependents, interval)
+    print(f"\nWatching {len(dependents)} source files for {len(group_names)} groups (Ctrl+C to stop)")
+    for path, groups in sorted(dependents.items()):
+        print(f"  {path} -> {', '.join(groups)}")
+
+    try:
+        while True:
+            changed = watcher.changes()
+            changed |= watcher.changes(DEBOUNCE_SECONDS)
+
+            print(f"\nChanged: {', '.join(sorted(changed))}")
+            affected = affected_groups(manifest, group_names, changed)
+            if affected:
+                rebuild(affected, low_memory, quality, manifest_path)
+            else:
+                print("Not the active source of any group, nothing to rebuild")
+    except KeyboardInterrupt:
+        print("\nStopped watching")
+    finally:
+        watcher.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Rebuild app icons and splash screens whenever a source logo changes")
+    parser.add_argument("groups", nargs="*", help="groups to watch (default: the manifest's default set)")
+    parser.add_argument("--low-memory", action="store_true",
+                        help="encode solid-background targets in row strips instead of full frames "
+                             "(a normal build rewrites them afterwards)")
+    parser.add_argument("--quality", choices=["draft", "release"], default="release",
+                        help="draft: refresh a contact sheet of quick previews instead of the outputs")
+    parser.add_argument("--interval", type=float, default=POLL_INTERVAL,
+                        help="seconds between checks when inotify is not available")
+    args = parser.parse_args()
+
+    try:
+        watch(args.groups, low_memory=args.low_memory, interval=args.interval, quality=args.quality)
+    except ManifestError as e:
+        print(f"Error: {e}")
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -6,26 +6,40 @@ Codemagic Build Automation Script
 
 import requests
 import json
+import os
 import time
 import sys
-from pathlib import Path
+
+from codemagic_download import DEFAULT_WORKERS, download_all
+from codemagic_http import API_URL, CodemagicHTTP
+from codemagic_polling import BuildHistory, build_duration, build_elapsed, format_eta, poll_interval
+
+# Τελικά status ενός build
+FINISHED_STATUSES = ['finished', 'failed', 'canceled', 'timeout']
+
+# Με webhooks: poll μόνο αν δεν έρθει κανένα event για τόσα δευτερόλεπτα
+WEBHOOK_FALLBACK_INTERVAL = 120
 
 class CodemagicAutomation:
-    def __init__(self, api_token):
+    def __init__(self, api_token, http=None):
         self.api_token = api_token
-        self.base_url = "https://api.codemagic.io"
-        self.headers = {
-            "x-auth-token": api_token,
-            "Content-Type": "application/json"
-        }
+        self.base_url = API_URL
+        # Ένα pooled session για όλες τις κλήσεις του run
+        self.http = http or CodemagicHTTP(api_token, self.base_url)
+        # build_id → (ETag, build data) για conditional requests
+        self._build_etags = {}
+    
+    def close(self):
+        self.http.close()
     
     def list_applications(self):
         """Λίστα όλων των applications"""
         print("📱 Ανάκτηση λίστας applications...")
-        response = requests.get(
-            f"{self.base_url}/apps",
-            headers=self.headers
-        )
+        try:
+            response = self.http.get("/apps")
+        except requests.RequestException as e:
+            print(f"❌ Error: {e}")
+            return []
         
         if response.status_code == 200:
             apps = response.json()
@@ -47,10 +61,11 @@ class CodemagicAutomation:
     def list_workflows(self, app_id):
         """Λίστα workflows για ένα app"""
         print(f"\n⚙️ Ανάκτηση workflows για app {app_id}...")
-        response = requests.get(
-            f"{self.base_url}/apps/{app_id}",
-            headers=self.headers
-        )
+        try:
+            response = self.http.get(f"/apps/{app_id}")
+        except requests.RequestException as e:
+            print(f"❌ Error: {e}")
+            return {}
         
         if response.status_code == 200:
             app_data = response.json()
@@ -76,11 +91,12 @@ class CodemagicAutomation:
             "branch": branch
         }
         
-        response = requests.post(
-            f"{self.base_url}/builds",
-            headers=self.headers,
-            json=payload
-        )
+        try:
+            response = self.http.post("/builds", json=payload)
+        except requests.RequestException as e:
+            # Μπορεί να ξεκίνησε: έλεγξε το dashboard πριν ξαναδοκιμάσεις
+            print(f"❌ Error: {e}")
+            return None
         
         if response.status_code == 201:
             build_data = response.json()
@@ -94,73 +110,105 @@ class CodemagicAutomation:
             return None
     
     def get_build_status(self, app_id, build_id):
-        """Ελέγχει το status ενός build"""
-        response = requests.get(
-            f"{self.base_url}/builds/{build_id}",
-            headers=self.headers
-        )
+        """Ελέγχει το status ενός build (conditional request όταν έχουμε ETag)"""
+        cached = self._build_etags.get(build_id)
+        headers = {"If-None-Match": cached[0]} if cached else {}
+        try:
+            response = self.http.get(f"/builds/{build_id}", headers=headers)
+        except requests.RequestException as e:
+            print(f"   ⚠️ Αποτυχία ελέγχου status: {e}")
+            return None
         
+        if response.status_code == 304 and cached:
+            # Τίποτα καινούργιο από το προηγούμενο poll
+            return cached[1]
         if response.status_code == 200:
-            return response.json()
+            build_data = response.json()
+            etag = response.headers.get("ETag")
+            if etag:
+                self._build_etags[build_id] = (etag, build_data)
+            return build_data
         else:
+            print(f"   ⚠️ Αποτυχία ελέγχου status: HTTP {response.status_code}")
             return None
     
-    def monitor_build(self, app_id, build_id):
-        """Παρακολουθεί ένα build μέχρι να ολοκληρωθεί"""
+    def monitor_build(self, app_id, build_id, webhook=None, fallback_interval=WEBHOOK_FALLBACK_INTERVAL,
+                      workflow_id=None, branch=None, history=None):
+        """Παρακολουθεί ένα build μέχρι να ολοκληρωθεί. Το poll προσαρμόζεται στην
+        εκτιμώμενη διάρκεια (ιστορικό του workflow/branch). Με webhook
+        (WebhookReceiver) κάθε event απλώς ξυπνάει το επόμενο poll: το status
+        και τα artefacts έρχονται πάντα από το API"""
         print(f"\n⏳ Παρακολούθηση build {build_id}...")
-        print("   (Αυτό μπορεί να πάρει 15-25 λεπτά)\n")
         
+        history = history or BuildHistory()
         start_time = time.time()
         last_status = None
+        estimate = None
+        known = False
+        live = sys.stdout.isatty()
+        version = webhook.version(build_id) if webhook else 0
+        build_data = None
+        
+        def report(status):
+            nonlocal last_status
+            if status != last_status:
+                elapsed = int(time.time() - start_time)
+                eta = ""
+                if estimate and status not in FINISHED_STATUSES:
+                    eta = f" · {format_eta(build_elapsed(build_data, elapsed), estimate)}"
+                print(f"\r   [{elapsed}s] Status: {status}{eta}".ljust(72))
+                last_status = status
         
         while True:
             build_data = self.get_build_status(app_id, build_id)
             
+            if build_data and estimate is None:
+                workflow_id = workflow_id or build_data.get('workflowId')
+                branch = branch or build_data.get('branch')
+                estimate = history.estimate(workflow_id, branch)
+                known = history.known(workflow_id, branch)
+                print(f"   (εκτιμώμενη διάρκεια ~{round(estimate / 60)} λεπτά για {workflow_id}@{branch})\n")
+            
             if build_data:
                 status = build_data.get('status')
+                report(status)
                 
-                if status != last_status:
-                    elapsed = int(time.time() - start_time)
-                    print(f"   [{elapsed}s] Status: {status}")
-                    last_status = status
-                
-                if status in ['finished', 'failed', 'canceled', 'timeout']:
+                if status in FINISHED_STATUSES:
                     print(f"\n🏁 Build ολοκληρώθηκε με status: {status}")
+                    if status == 'finished' and workflow_id:
+                        history.record(workflow_id, branch,
+                                       build_duration(build_data, time.time() - start_time))
                     return build_data
             
-            time.sleep(30)  # Check κάθε 30 δευτερόλεπτα
+            if webhook is None:
+                # Αραιά νωρίς στο build, πυκνά κοντά στο αναμενόμενο τέλος
+                elapsed = build_elapsed(build_data, time.time() - start_time)
+                interval = poll_interval(elapsed, estimate or 0, known)
+                if live and estimate:
+                    print(f"\r   ⏱ {last_status} · {format_eta(elapsed, estimate)} · "
+                          f"επόμενος έλεγχος σε {interval:.0f}s".ljust(72), end="", flush=True)
+                time.sleep(interval)
+                continue
+            
+            # Περίμενε το επόμενο webhook event αντί για poll; το payload δεν
+            # χρησιμοποιείται, μόνο ξυπνάει το επόμενο poll του API
+            event, version = webhook.wait(build_id, version, fallback_interval)
+            if event is None:
+                print(f"   (κανένα webhook event για {fallback_interval}s, έλεγχος μέσω API)")
     
-    def download_artifacts(self, build_data, output_dir="./builds"):
-        """Κατεβάζει τα artifacts από ένα build"""
+    def download_artifacts(self, build_data, output_dir="./builds", workers=DEFAULT_WORKERS):
+        """Κατεβάζει τα artifacts από ένα build (παράλληλα, με resume και έλεγχο hash)"""
         artifacts = build_data.get('artefacts', [])
         
         if not artifacts:
             print("⚠️ Δεν βρέθηκαν artifacts")
-            return
-        
-        Path(output_dir).mkdir(exist_ok=True)
+            return {}
         
         print(f"\n📥 Λήψη artifacts ({len(artifacts)} αρχεία)...")
-        
-        for artifact in artifacts:
-            name = artifact.get('name')
-            url = artifact.get('url')
-            
-            if url and name:
-                print(f"   Downloading: {name}")
-                
-                response = requests.get(url, stream=True)
-                if response.status_code == 200:
-                    output_path = Path(output_dir) / name
-                    with open(output_path, 'wb') as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                    print(f"   ✅ Saved to: {output_path}")
-                else:
-                    print(f"   ❌ Failed to download {name}")
+        return download_all(self.http, artifacts, output_dir, workers)
     
-    def full_build_process(self, workflow_id="ios-development", branch="main"):
-        """Ολοκληρωμένη διαδικασία build"""
+    def full_build_process(self, workflow_id="ios-development", branch="main", webhook=None):
+        """Ολοκληρωμένη διαδικασία build (με webhook: WebhookReceiver αντί για polling)"""
         print("=" * 60)
         print("🚀 CODEMAGIC BUILD AUTOMATION")
         print("=" * 60)
@@ -186,7 +234,7 @@ class CodemagicAutomation:
         print(f"   https://codemagic.io/app/{app_id}/build/{build_id}")
         
         # 4. Παρακολούθηση
-        build_data = self.monitor_build(app_id, build_id)
+        build_data = self.monitor_build(app_id, build_id, webhook, workflow_id=workflow_id, branch=branch)
         
         # 5. Download artifacts
         if build_data.get('status') == 'finished':
@@ -216,23 +264,46 @@ def main():
     print("   python codemagic_automation.py abc123xyz456...\n")
     print("=" * 60)
     
-    if len(sys.argv) < 2:
+    # --option ή --option=value, οτιδήποτε άλλο είναι positional
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    options = dict(arg[2:].partition("=")[::2] for arg in sys.argv[1:] if arg.startswith("--"))
+    
+    if len(args) < 1:
         print("\n⚠️ Δεν δόθηκε API token!")
         print("\nΧρήση:")
-        print("   python codemagic_automation.py <API_TOKEN> [workflow] [branch]")
+        print("   python codemagic_automation.py <API_TOKEN> [workflow] [branch] [--webhook[=PORT]]")
         print("\nWorkflows:")
         print("   - ios-development (default, δωρεάν, χωρίς code signing)")
         print("   - ios-workflow (production, με code signing)")
         print("\nBranch:")
         print("   - main (default)")
+        print("\n--webhook[=PORT]: περίμενε τα webhooks του Codemagic αντί για polling")
+        print("   (secret στο CODEMAGIC_WEBHOOK_SECRET → URL .../codemagic?token=<secret>)")
         sys.exit(1)
     
-    api_token = sys.argv[1]
-    workflow = sys.argv[2] if len(sys.argv) > 2 else "ios-development"
-    branch = sys.argv[3] if len(sys.argv) > 3 else "main"
+    api_token = args[0]
+    workflow = args[1] if len(args) > 1 else "ios-development"
+    branch = args[2] if len(args) > 2 else "main"
+    
+    webhook = None
+    if "webhook" in options:
+        from codemagic_webhook import DEFAULT_PORT, WebhookReceiver
+        port = int(options["webhook"] or DEFAULT_PORT)
+        webhook = WebhookReceiver(port=port, secret=os.environ.get("CODEMAGIC_WEBHOOK_SECRET")).start()
+        print(f"\n👂 Webhook listener στη θύρα {webhook.port} (fallback σε polling κάθε "
+              f"{WEBHOOK_FALLBACK_INTERVAL}s χωρίς events)")
     
     automation = CodemagicAutomation(api_token)
-    automation.full_build_process(workflow, branch)
+    try:
+        automation.full_build_process(workflow, branch, webhook)
+    finally:
+        if webhook:
+            webhook.stop()
+        stats = automation.http.stats
+        print(f"\n🌐 HTTP: {stats['requests']} requests ({stats['not_modified']} not modified), "
+              f"{stats['retries']} retries, "
+              f"{stats['throttled']:.0f}s rate-limit αναμονή")
+        automation.close()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+Παράλληλη, συνεχιζόμενη και επαληθευμένη λήψη artifacts
+
+Κάθε artifact κατεβαίνει σε ένα αρχείο .part (ή, όταν είναι μεγάλο, σε
+ranged segments .part0, .part1, ... που κατεβαίνουν παράλληλα) μέσα από
+ένα κοινό, φραγμένο thread pool. Αν η σύνδεση κοπεί, η λήψη συνεχίζει από
+εκεί που έμεινε με HTTP Range, ακόμα και σε επόμενο run. Στο τέλος το
+μέγεθος και το hash (md5/sha256 όταν τα δίνει το API) ελέγχονται πριν το
+αρχείο πάρει το τελικό του όνομα.
+"""
+
+import hashlib
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+import requests
+
+DEFAULT_WORKERS = 4
+
+# Μέγεθος buffer ανάγνωσης/εγγραφής
+CHUNK_SIZE = 1024 * 1024
+
+# Αρχεία από αυτό το μέγεθος και πάνω σπάνε σε ranged segments
+SPLIT_THRESHOLD = 64 * 1024 * 1024
+MIN_SEGMENT = 16 * 1024 * 1024
+
+# Επαναλήψεις ενός segment όταν η σύνδεση κόβεται στη μέση
+SEGMENT_RETRIES = 5
+
+# (connect, read) δευτερόλεπτα
+DOWNLOAD_TIMEOUT = (5, 60)
+
+
+class RangeNotSupported(Exception):
+    """Ο server αγνόησε το Range header"""
+
+
+class DownloadError(Exception):
+    pass
+
+
+class Segment:
+    """Κομμάτι [start, end] ενός artifact (end None: άγνωστο μέγεθος, ως το τέλος)"""
+
+    def __init__(self, path, start=0, end=None):
+        self.path = path
+        self.start = start
+        self.end = end
+
+    @property
+    def length(self):
+        return None if self.end is None else self.end - self.start + 1
+
+    def done_bytes(self):
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+
+class Artifact:
+    """Ένα artifact του build και τα segments του"""
+
+    def __init__(self, metadata, output_dir):
+        self.name = Path(metadata['name']).name
+        self.url = metadata['url']
+        self.size = metadata.get('size')
+        self.md5 = metadata.get('md5')
+        self.sha256 = metadata.get('sha256')
+        self.path = Path(output_dir) / self.name
+        # Το URL είναι ανά build: ένα .part άλλου build με το ίδιο όνομα δεν συνεχίζεται
+        self.tag = hashlib.sha256(self.url.encode('utf-8')).hexdigest()[:8]
+        self.part_path = Path(f"{self.path}.{self.tag}.part")
+        self.segments = []
+
+    def remove_stale_parts(self):
+        """Σβήνει τα .part προηγούμενων builds για το ίδιο όνομα"""
+        for path in self.path.parent.glob(f"{self.name}.*.part*"):
+            if not path.name.startswith(f"{self.name}.{self.tag}.part"):
+                path.unlink()
+
+    def plan(self, workers, split=True):
+        """Segments για λήψη: ένα, ή έως workers ranged κομμάτια για μεγάλα αρχεία"""
+        count = 1
+        if split and self.size and self.size >= SPLIT_THRESHOLD:
+            count = max(1, min(workers, self.size // MIN_SEGMENT))
+        if count == 1:
+            end = self.size - 1 if self.size else None
+            self.segments = [Segment(self.part_path, 0, end)]
+        else:
+            step = -(-self.size // count)
+            self.segments = [Segment(Path(f"{self.part_path}{index}"), start, min(start + step, self.size) - 1)
+                             for index, start in enumerate(range(0, self.size, step))]
+        return self.segments
+
+    def downloaded(self):
+        return sum(segment.done_bytes() for segment in self.segments)
+
+
+def fetch_segment(http, url, segment, progress=None):
+    """Κατεβάζει (ή συνεχίζει) ένα segment στο αρχείο του"""
+    for attempt in range(SEGMENT_RETRIES + 1):
+        done = segment.done_bytes()
+        if segment.length is not None and done >= segment.length:
+            return
+        headers = {}
+        if done or segment.start or segment.end is not None:
+            end = "" if segment.end is None else segment.end
+            headers["Range"] = f"bytes={segment.start + done}-{end}"
+
+        try:
+            with http.get(url, headers=headers, stream=True, timeout=DOWNLOAD_TIMEOUT) as response:
+                if response.status_code == 416 and segment.end is None and done:
+                    # Το .part είναι ήδη ολόκληρο
+                    return
+                if response.status_code == 200 and "Range" in headers:
+                    # Χωρίς Range support μόνο ένα segment που καλύπτει όλο το αρχείο προχωράει
+                    whole = segment.start == 0 and (segment.end is None
+                                                    or segment.length == segment_size(response))
+                    if not whole:
+                        raise RangeNotSupported(url)
+                    # Ολόκληρο το αρχείο από την αρχή
+                    done = 0
+                elif response.status_code == 206 and range_start(response) != segment.start + done:
+                    # Τα bytes δεν ξεκινούν εκεί που σταμάτησε το .part: κανένα append
+                    raise RangeNotSupported(f"{url}: Content-Range "
+                                            f"'{response.headers.get('Content-Range', '')}' "
+                                            f"αντί για bytes {segment.start + done}-")
+                elif response.status_code not in (200, 206):
+                    raise DownloadError(f"HTTP {response.status_code}")
+
+                with open(segment.path, 'ab' if done else 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=CHUNK_SIZE):
+                        f.write(chunk)
+                        if progress is not None:
+                            progress(len(chunk))
+            return
+        except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+            if attempt == SEGMENT_RETRIES:
+                raise DownloadError(f"{e.__class__.__name__} μετά από {attempt + 1} προσπάθειες")
+            delay = http.backoff(attempt)
+            print(f"   ⚠️ {segment.path.name}: {e.__class__.__name__}, συνέχεια σε {delay:.1f}s "
+                  f"από {segment.done_bytes() // 1024} KB")
+            time.sleep(delay)
+
+
+def range_start(response):
+    """Πρώτο byte του Content-Range ενός 206, None αν λείπει ή δεν διαβάζεται"""
+    unit, _, spec = response.headers.get("Content-Range", "").partition(" ")
+    first = spec.partition("-")[0]
+    return int(first) if unit == "bytes" and first.isdigit() else None
+
+
+def segment_size(response):
+    length = response.headers.get("Content-Length")
+    return int(length) if length and length.isdigit() else None
+
+
+def file_digests(path):
+    """(md5, sha256) ενός αρχείου"""
+    md5, sha256 = hashlib.md5(), hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(CHUNK_SIZE), b''):
+            md5.update(chunk)
+            sha256.update(chunk)
+    return md5.hexdigest(), sha256.hexdigest()
+
+
+def finish(artifact):
+    """Ενώνει τα segments, επαληθεύει μέγεθος και hash, και δίνει το τελικό όνομα"""
+    if len(artifact.segments) > 1:
+        with open(artifact.part_path, 'wb') as out:
+            for segment in artifact.segments:
+                with open(segment.path, 'rb') as f:
+                    while True:
+                        chunk = f.read(CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        out.write(chunk)
+        for segment in artifact.segments:
+            os.remove(segment.path)
+
+    size = os.path.getsize(artifact.part_path)
+    problem = None
+    if artifact.size is not None and size != artifact.size:
+        problem = f"μέγεθος {size} αντί για {artifact.size}"
+    elif artifact.md5 or artifact.sha256:
+        md5, sha256 = file_digests(artifact.part_path)
+        if artifact.md5 and md5 != artifact.md5.lower():
+            problem = "λάθος md5"
+        elif artifact.sha256 and sha256 != artifact.sha256.lower():
+            problem = "λάθος sha256"
+    if problem:
+        # Χαλασμένο αρχείο: η επόμενη προσπάθεια ξεκινά από την αρχή
+        os.remove(artifact.part_path)
+        raise DownloadError(problem)
+
+    os.replace(artifact.part_path, artifact.path)
+    return size
+
+
+def download_all(http, artifacts, output_dir="./builds", workers=DEFAULT_WORKERS):
+    """Κατεβάζει τα artifacts (metadata του API) παράλληλα; επιστρέφει
+    {όνομα: path} για όσα κατέβηκαν και επαληθεύτηκαν"""
+    Path(output_dir).mkdir(parents=True, exist_ok=True)
+    items = [Artifact(metadata, output_dir) for metadata in artifacts
+             if metadata.get('name') and metadata.get('url')]
+    for artifact in items:
+        artifact.remove_stale_parts()
+        artifact.plan(workers)
+        if artifact.downloaded():
+            print(f"   ↻ {artifact.name}: συνέχεια από {artifact.downloaded() / 1024 / 1024:.1f} MB")
+
+    lock = threading.Lock()
+    received = [0]
+
+    def progress(count):
+        with lock:
+            received[0] += count
+
+    start = time.time()
+    results = {}
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = {}
+        remaining = {}
+
+        def submit(artifact):
+            remaining[artifact.name] = len(artifact.segments)
+            for segment in artifact.segments:
+                pending[pool.submit(fetch_segment, http, artifact.url, segment, progress)] = artifact
+
+        for artifact in items:
+            submit(artifact)
+
+        while pending:
+            future = next(iter(wait(pending, return_when=FIRST_COMPLETED).done))
+            artifact = pending.pop(future)
+            try:
+                future.result()
+            except RangeNotSupported as e:
+                if len(artifact.segments) == 1 and remaining.pop(artifact.name, None):
+                    # Ούτε ολόκληρο δεν κατεβαίνει σωστά: η επόμενη εκτέλεση ξεκινά από την αρχή
+                    print(f"   ❌ Failed to download {artifact.name}: {e}")
+                    if os.path.exists(artifact.segments[0].path):
+                        os.remove(artifact.segments[0].path)
+                elif remaining.get(artifact.name):
+                    print(f"   ⚠️ {artifact.name}: ο server δεν υποστηρίζει Range, λήψη ως ένα αρχείο")
+                    for other in [f for f, a in pending.items() if a is artifact]:
+                        other.cancel()
+                        pending.pop(other)
+                    # Τα μισά segments δεν ενώνονται: ξεκίνα καθαρά
+                    for segment in artifact.segments:
+                        if os.path.exists(segment.path):
+                            os.remove(segment.path)
+                    artifact.plan(workers, split=False)
+                    submit(artifact)
+                continue
+            except (DownloadError, requests.RequestException, OSError) as e:
+                print(f"   ❌ Failed to download {artifact.name}: {e}")
+                remaining.pop(artifact.name, None)
+                continue
+
+            if artifact.name not in remaining:
+                # Ένα άλλο segment του απέτυχε ήδη
+                continue
+            remaining[artifact.name] -= 1
+            if remaining[artifact.name]:
+                continue
+            del remaining[artifact.name]
+            try:
+                size = finish(artifact)
+            except (DownloadError, OSError) as e:
+                print(f"   ❌ {artifact.name}: {e}")
+                continue
+            verified = " ✓ hash" if artifact.md5 or artifact.sha256 else ""
+            print(f"   ✅ Saved to: {artifact.path} ({size / 1024 / 1024:.1f} MB{verified})")
+            results[artifact.name] = artifact.path
+
+    elapsed = max(time.time() - start, 1e-6)
+    print(f"   {received[0] / 1024 / 1024:.1f} MB σε {elapsed:.1f}s "
+          f"({received[0] / 1024 / 1024 / elapsed:.1f} MB/s, {workers} παράλληλες λήψεις)")
+    return results
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Κοινό HTTP layer για το Codemagic API
+
+Ένα requests.Session για όλο το run (keep-alive, ένα TLS handshake ανά host),
+timeouts σε κάθε κλήση, επανάληψη με jittered exponential backoff σε
+σφάλματα δικτύου, 429 και 5xx, και throttling που σέβεται το Retry-After
+και ισχύει για όλες τις κλήσεις (και από πολλά threads).
+
+Το x-auth-token στέλνεται μόνο στο Codemagic API, ποτέ στα URLs των
+artifacts.
+"""
+
+import email.utils
+import random
+import threading
+import time
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+API_URL = "https://api.codemagic.io"
+
+# (connect, read) δευτερόλεπτα
+DEFAULT_TIMEOUT = (5, 30)
+
+# Status codes που αξίζει να ξαναδοκιμαστούν
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+# Ένα POST (π.χ. νέο build) επαναλαμβάνεται μόνο όταν σίγουρα δεν εκτελέστηκε
+UNPROCESSED_STATUSES = {429, 503}
+
+DEFAULT_RETRIES = 4
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 30.0
+
+# Μέγιστη αναμονή που δεχόμαστε από ένα Retry-After
+RETRY_AFTER_MAX = 120.0
+
+POOL_SIZE = 10
+
+
+def origin(url):
+    """(scheme, host[:port]) ενός URL, σε πεζά"""
+    parsed = urlparse(url)
+    return parsed.scheme.lower(), parsed.netloc.lower()
+
+
+def retry_after(response):
+    """Δευτερόλεπτα από το Retry-After header (αριθμός ή HTTP date), ή None"""
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), RETRY_AFTER_MAX)
+
+
+class _Session(requests.Session):
+    """Session που δεν μεταφέρει το x-auth-token σε redirect προς άλλο host"""
+
+    def rebuild_auth(self, prepared_request, response):
+        super().rebuild_auth(prepared_request, response)
+        if origin(prepared_request.url) != origin(response.request.url):
+            prepared_request.headers.pop("x-auth-token", None)
+
+
+class CodemagicHTTP:
+    """Pooled, retrying, rate-limit-aware client για το Codemagic API"""
+
+    def __init__(self, api_token, base_url=API_URL, timeout=DEFAULT_TIMEOUT, retries=DEFAULT_RETRIES,
+                 pool_size=POOL_SIZE):
+        self.base_url = base_url
+        self.api_origin = origin(base_url)
+        self.timeout = timeout
+        self.retries = retries
+        self.api_headers = {
+            "x-auth-token": api_token,
+            "Content-Type": "application/json"
+        }
+
+        self.session = _Session()
+        # Οι επαναλήψεις γίνονται εδώ, όχι στο urllib3
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        # Καμία κλήση πριν από αυτή τη στιγμή (time.monotonic), μετά από 429
+        self._not_before = 0.0
+        self._lock = threading.Lock()
+        # Τα stats τα ενημερώνουν όλα τα threads που μοιράζονται το client
+        self._stats_lock = threading.Lock()
+        self.stats = {"requests": 0, "retries": 0, "not_modified": 0, "throttled": 0.0}
+
+    def url(self, path):
+        return path if path.startswith(("http://", "https://")) else self.base_url + path
+
+    def is_api_url(self, url):
+        """True μόνο για URLs με ακριβώς το scheme και host του API (όχι π.χ.
+        api.codemagic.io.example.com)"""
+        return origin(url) == self.api_origin
+
+    def _count(self, name, amount=1):
+        with self._stats_lock:
+            self.stats[name] += amount
+
+    def _wait_turn(self):
+        with self._lock:
+            delay = self._not_before - time.monotonic()
+        if delay > 0:
+            self._count("throttled", delay)
+            time.sleep(delay)
+
+    def _throttle(self, seconds):
+        """Σταματά όλες τις κλήσεις για seconds"""
+        with self._lock:
+            self._not_before = max(self._not_before, time.monotonic() + seconds)
+
+    @staticmethod
+    def backoff(attempt):
+        """Full-jitter exponential backoff για την προσπάθεια attempt (από 0)"""
+        return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+
+    def request(self, method, path, idempotent=None, timeout=None, retries=None, **kwargs):
+        """HTTP κλήση με retries; επιστρέφει το τελευταίο response ή σηκώνει
+        το τελευταίο requests.RequestException"""
+        url = self.url(path)
+        if idempotent is None:
+            idempotent = method.upper() in ("GET", "HEAD", "PUT", "DELETE", "OPTIONS")
+        if retries is None:
+            retries = self.retries
+        if self.is_api_url(url):
+            kwargs["headers"] = dict(self.api_headers, **kwargs.get("headers", {}))
+
+        attempt = 0
+        while True:
+            self._wait_turn()
+            self._count("requests")
+            try:
+                response = self.session.request(method, url, timeout=timeout or self.timeout, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                # Ένα POST που ίσως έφτασε στον server δεν επαναλαμβάνεται
+                sent = not isinstance(e, requests.ConnectTimeout)
+                if attempt >= retries or (sent and not idempotent):
+                    raise
+                delay = self.backoff(attempt)
+                reason = e.__class__.__name__
+            else:
+                if response.status_code == 304:
+                    self._count("not_modified")
+                statuses = RETRY_STATUSES if idempotent else UNPROCESSED_STATUSES
+                if response.status_code not in statuses or attempt >= retries:
+                    return response
+                delay = retry_after(response)
+                if delay is None:
+                    delay = self.backoff(attempt)
+                if response.status_code == 429:
+                    # Το όριο αφορά το token, όχι μόνο αυτή την κλήση
+                    self._throttle(delay)
+                reason = f"HTTP {response.status_code}"
+                response.close()
+
+            attempt += 1
+            self._count("retries")
+            print(f"   ⚠️ {reason} στο {method} {path}, νέα προσπάθεια σε {delay:.1f}s ({attempt}/{retries})")
+            time.sleep(delay)
+
+    def get(self, path, **kwargs):
+        return self.request("GET", path, **kwargs)
+
+    def post(self, path, **kwargs):
+        return self.request("POST", path, **kwargs)
+
+    def close(self):
+        self.session.close()
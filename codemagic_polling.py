@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Adaptive polling για τα builds του Codemagic
+
+Η διάρκεια ενός build εκτιμάται από τα προηγούμενα builds του ίδιου
+workflow και branch (median των τελευταίων HISTORY_SIZE). Νωρίς στο build
+το poll αραιώνει, κοντά στο αναμενόμενο τέλος πυκνώνει, ώστε το τέλος να
+φαίνεται γρήγορα με λιγότερες κλήσεις συνολικά. Μετά την εκτίμηση, ή χωρίς
+ιστορικό, το poll δεν αραιώνει ποτέ πέρα από το παλιό σταθερό FALLBACK_INTERVAL.
+"""
+
+import json
+import os
+import statistics
+import time
+from datetime import datetime
+
+HISTORY_PATH = os.path.join(".codemagic", "build-history.json")
+HISTORY_VERSION = 1
+
+# Διάρκειες που κρατάμε ανά (workflow, branch)
+HISTORY_SIZE = 10
+
+# Εκτίμηση όταν δεν υπάρχει ιστορικό (τα iOS builds παίρνουν 15-25 λεπτά)
+DEFAULT_ESTIMATE = 20 * 60
+
+# Όρια και κλάσμα του υπολοίπου χρόνου για το επόμενο poll
+MIN_INTERVAL = 10
+MAX_INTERVAL = 120
+REMAINING_FRACTION = 0.25
+
+# Το παλιό σταθερό poll: όριο χωρίς ιστορικό και αφού περάσει η εκτίμηση
+FALLBACK_INTERVAL = 30
+
+# Μετά την εκτίμηση το poll αραιώνει αργά από το MIN_INTERVAL
+OVERDUE_FRACTION = 0.05
+
+
+class BuildHistory:
+    """Διάρκειες ολοκληρωμένων builds ανά workflow και branch"""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self.durations = {}
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == HISTORY_VERSION:
+                self.durations = data.get('durations', {})
+        except (OSError, ValueError):
+            # Χωρίς ιστορικό απλώς ξεκινάμε από την default εκτίμηση
+            pass
+
+    @staticmethod
+    def _key(workflow_id, branch):
+        return f"{workflow_id}@{branch}"
+
+    def estimate(self, workflow_id, branch):
+        """Αναμενόμενη διάρκεια σε δευτερόλεπτα: median του ίδιου workflow και
+        branch, αλλιώς του workflow σε όλα τα branches, αλλιώς DEFAULT_ESTIMATE"""
+        durations = self.durations.get(self._key(workflow_id, branch))
+        if not durations:
+            prefix = f"{workflow_id}@"
+            durations = [seconds for key, values in self.durations.items() if key.startswith(prefix)
+                         for seconds in values]
+        return statistics.median(durations) if durations else DEFAULT_ESTIMATE
+
+    def known(self, workflow_id, branch):
+        """True αν η estimate() βασίζεται σε ιστορικό και όχι στο DEFAULT_ESTIMATE"""
+        # Ίδια σειρά με την estimate(): workflow και branch, αλλιώς όλο το workflow
+        prefix = f"{workflow_id}@"
+        return any(values for key, values in self.durations.items() if key.startswith(prefix))
+
+    def record(self, workflow_id, branch, seconds):
+        key = self._key(workflow_id, branch)
+        self.durations[key] = (self.durations.get(key, []) + [round(seconds)])[-HISTORY_SIZE:]
+        self.save()
+
+    def save(self):
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': HISTORY_VERSION, 'durations': self.durations}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def poll_interval(elapsed, estimate, known=True):
+    """Δευτερόλεπτα μέχρι το επόμενο poll: ένα κλάσμα του χρόνου που
+    απομένει, μέσα στα όρια. Αφού περάσει η εκτίμηση το build μπορεί να
+    τελειώσει κάθε στιγμή, οπότε το poll ξεκινά από MIN_INTERVAL και
+    αραιώνει αργά ως το FALLBACK_INTERVAL. Χωρίς ιστορικό (known False) η
+    εκτίμηση είναι μαντεψιά και το όριο είναι επίσης FALLBACK_INTERVAL"""
+    remaining = estimate - elapsed
+    if remaining > 0:
+        interval = remaining * REMAINING_FRACTION
+        limit = MAX_INTERVAL if known else FALLBACK_INTERVAL
+    else:
+        interval = MIN_INTERVAL + -remaining * OVERDUE_FRACTION
+        limit = FALLBACK_INTERVAL
+    return min(limit, max(MIN_INTERVAL, interval))
+
+
+def _timestamp(value):
+    """Unix time ενός ISO 8601 timestamp του API, ή None"""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace('Z', '+00:00')).timestamp()
+    except (AttributeError, ValueError):
+        return None
+
+
+def build_elapsed(build_data, fallback):
+    """Δευτερόλεπτα από το startedAt του build, αλλιώς fallback"""
+    started = _timestamp((build_data or {}).get('startedAt'))
+    if started is None:
+        return fallback
+    return max(0.0, time.time() - started)
+
+
+def build_duration(build_data, fallback):
+    """Διάρκεια ενός ολοκληρωμένου build (finishedAt - startedAt), αλλιώς fallback"""
+    started = _timestamp(build_data.get('startedAt'))
+    finished = _timestamp(build_data.get('finishedAt'))
+    if started is None or finished is None or finished < started:
+        return fallback
+    return finished - started
+
+
+def format_eta(elapsed, estimate):
+    """π.χ. 'ETA 14:32 (~12 λεπτά)', ή πόσο έχει ξεπεράσει την εκτίμηση"""
+    remaining = estimate - elapsed
+    if remaining <= 0:
+        return f"+{int(-remaining // 60)} λεπτά πάνω από την εκτίμηση"
+    finish = time.strftime('%H:%M', time.localtime(time.time() + remaining))
+    return f"ETA {finish} (~{max(1, round(remaining / 60))} λεπτά)"
@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Παράλληλα release builds στο Codemagic
+
+Ξεκινάει N builds (workflow:branch) μαζί, τα παρακολουθεί όλα σε ένα
+asyncio event loop με κοινό πίνακα status και κατεβάζει τα artifacts κάθε
+build μόλις τελειώσει εκείνο. Ο συνολικός χρόνος είναι όσο το πιο αργό
+build, όχι το άθροισμά τους.
+
+Χρήση:
+    python codemagic_release.py <API_TOKEN> ios-production android-release:main ios-development:develop
+                                [--output ./builds] [--webhook[=PORT]]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from codemagic_automation import FINISHED_STATUSES, WEBHOOK_FALLBACK_INTERVAL, CodemagicAutomation
+from codemagic_download import download_all
+from codemagic_polling import BuildHistory, build_duration, build_elapsed, format_eta, poll_interval
+
+DEFAULT_BRANCH = "main"
+
+
+class BuildState:
+    """Κατάσταση ενός build του release"""
+
+    def __init__(self, workflow_id, branch):
+        self.workflow_id = workflow_id
+        self.branch = branch
+        self.build_id = None
+        self.status = "starting"
+        self.started = time.time()
+        self.elapsed = 0.0
+        self.estimate = None
+        self.known = False
+        self.build_data = None
+        self.artifacts = {}
+        self.note = ""
+
+    @property
+    def label(self):
+        return f"{self.workflow_id}@{self.branch}"
+
+    @property
+    def done(self):
+        return self.status in FINISHED_STATUSES or self.status in ("not started", "error")
+
+
+def parse_target(target):
+    """'workflow[:branch]' → (workflow, branch)"""
+    workflow_id, _, branch = target.partition(":")
+    return workflow_id, branch or DEFAULT_BRANCH
+
+
+def print_status(states):
+    """Κοινός πίνακας status όλων των builds"""
+    print(f"\n   {'build':32} {'status':12} {'χρόνος':>7}  ")
+    for state in states:
+        if state.done or not state.estimate:
+            detail = state.note
+        else:
+            detail = format_eta(state.elapsed, state.estimate)
+        print(f"   {state.label:32} {state.status:12} {int(state.elapsed) // 60:4}:{int(state.elapsed) % 60:02}  {detail}")
+    sys.stdout.flush()
+
+
+class Release:
+    """Asyncio fan-out πάνω από το CodemagicAutomation: τα blocking HTTP calls
+    τρέχουν σε threads, η αναμονή και ο συντονισμός στο event loop"""
+
+    def __init__(self, automation, app_id, output_dir="./builds", webhook=None, history=None):
+        self.automation = automation
+        self.app_id = app_id
+        self.output_dir = output_dir
+        self.webhook = webhook
+        self.history = history or BuildHistory()
+        self.states = []
+        self._changed = None
+
+    def _update(self, state, status=None, note=None):
+        if status is not None and status != state.status:
+            state.status = status
+            self._changed.set()
+        if note is not None and note != state.note:
+            state.note = note
+            self._changed.set()
+
+    async def _wait(self, state, seconds, version):
+        """Περιμένει seconds ή (με webhook) το επόμενο event του build"""
+        if self.webhook is None:
+            await asyncio.sleep(seconds)
+            return version
+        timeout = min(seconds, WEBHOOK_FALLBACK_INTERVAL)
+        _, version = await asyncio.to_thread(self.webhook.wait, state.build_id, version, timeout)
+        return version
+
+    async def run_build(self, state):
+        """Ξεκινάει, παρακολουθεί και κατεβάζει ένα build"""
+        state.build_id = await asyncio.to_thread(self.automation.start_build, self.app_id,
+                                                 state.workflow_id, state.branch)
+        if not state.build_id:
+            self._update(state, "not started", "❌ αποτυχία έναρξης")
+            return state
+        state.started = time.time()
+        state.estimate = self.history.estimate(state.workflow_id, state.branch)
+        state.known = self.history.known(state.workflow_id, state.branch)
+        self._update(state, "queued")
+
+        version = self.webhook.version(state.build_id) if self.webhook else 0
+        while True:
+            build_data = await asyncio.to_thread(self.automation.get_build_status, self.app_id, state.build_id)
+            state.elapsed = build_elapsed(build_data, time.time() - state.started)
+            if build_data:
+                state.build_data = build_data
+                self._update(state, build_data.get('status'))
+                if state.status in FINISHED_STATUSES:
+                    break
+            version = await self._wait(state, poll_interval(state.elapsed, state.estimate, state.known), version)
+
+        if state.status != 'finished':
+            self._update(state, note="❌ δες τα logs στο Codemagic")
+            return state
+
+        self.history.record(state.workflow_id, state.branch,
+                            build_duration(state.build_data, time.time() - state.started))
+        artifacts = state.build_data.get('artefacts', [])
+        self._update(state, note=f"📥 λήψη {len(artifacts)} artifacts")
+        # Κάθε build στον δικό του φάκελο, μόλις τελειώσει
+        output_dir = os.path.join(self.output_dir, f"{state.workflow_id}-{state.branch}".replace("/", "-"))
+        state.artifacts = await asyncio.to_thread(download_all, self.automation.http, artifacts, output_dir)
+        self._update(state, note=f"✅ {len(state.artifacts)}/{len(artifacts)} artifacts στο {output_dir}")
+        return state
+
+    async def _run_isolated(self, state):
+        """run_build χωρίς να παρασύρει τα υπόλοιπα builds: ένα σφάλμα (API,
+        δίκτυο, δίσκος) σημειώνει μόνο αυτό το build ως αποτυχημένο"""
+        try:
+            return await self.run_build(state)
+        except Exception as e:
+            state.elapsed = build_elapsed(state.build_data, time.time() - state.started)
+            self._update(state, "error", f"❌ {e.__class__.__name__}: {e}")
+            return state
+
+    async def _status_view(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._changed.wait(), timeout=60)
+            except asyncio.TimeoutError:
+                # Ανανέωση των χρόνων και των ETA έστω και χωρίς αλλαγές
+                for state in self.states:
+                    if not state.done and state.build_id:
+                        state.elapsed = build_elapsed(state.build_data, time.time() - state.started)
+            self._changed.clear()
+            print_status(self.states)
+
+    async def run(self, targets):
+        """Τρέχει όλα τα (workflow, branch) μαζί; επιστρέφει τα BuildState"""
+        self.states = [BuildState(workflow_id, branch) for workflow_id, branch in targets]
+        self._changed = asyncio.Event()
+        # Κάθε build μπορεί να κρατάει ένα thread σε webhook.wait και ένα σε λήψη
+        executor = ThreadPoolExecutor(max_workers=2 * len(self.states) + 2)
+        asyncio.get_running_loop().set_default_executor(executor)
+        view = asyncio.create_task(self._status_view())
+        try:
+            await asyncio.gather(*(self._run_isolated(state) for state in self.states))
+        finally:
+            view.cancel()
+        if self._changed.is_set():
+            print_status(self.states)
+        return self.states
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Ξεκίνα και παρακολούθησε πολλά Codemagic builds παράλληλα")
+    parser.add_argument("api_token")
+    parser.add_argument("targets", nargs="+", metavar="WORKFLOW[:BRANCH]",
+                        help=f"workflows για build (default branch: {DEFAULT_BRANCH})")
+    parser.add_argument("--app", default="getfitskg", help="όνομα του app στο Codemagic")
+    parser.add_argument("--output", default="./builds", help="φάκελος για τα artifacts")
+    parser.add_argument("--webhook", nargs="?", const=0, type=int, metavar="PORT",
+                        help="περίμενε τα webhooks του Codemagic αντί για polling")
+    args = parser.parse_args()
+
+    automation = CodemagicAutomation(args.api_token)
+    webhook = None
+    try:
+        app_id = automation.get_app_id(args.app)
+        if not app_id:
+            print(f"❌ Δεν βρέθηκε το app '{args.app}'")
+            sys.exit(1)
+
+        if args.webhook is not None:
+            from codemagic_webhook import DEFAULT_PORT, WebhookReceiver
+            webhook = WebhookReceiver(port=args.webhook or DEFAULT_PORT,
+                                      secret=os.environ.get("CODEMAGIC_WEBHOOK_SECRET")).start()
+            print(f"👂 Webhook listener στη θύρα {webhook.port}")
+
+        targets = [parse_target(target) for target in args.targets]
+        start = time.time()
+        release = Release(automation, app_id, args.output, webhook)
+        states = asyncio.run(release.run(targets))
+        print(f"\n🏁 {len(states)} builds σε {(time.time() - start) / 60:.1f} λεπτά")
+        if any(state.status != 'finished' for state in states):
+            sys.exit(1)
+    finally:
+        if webhook:
+            webhook.stop()
+        automation.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+"""
+Τοπικός receiver για τα build webhooks του Codemagic
+
+Αντί να ρωτάμε το API κάθε 30 δευτερόλεπτα, ένας μικρός HTTP listener
+δέχεται τα webhooks του Codemagic και ξυπνάει αμέσως όποιον περιμένει το
+build. Αν δεν έρθει κανένα event για fallback_interval, το monitor_build
+κάνει κανονικό poll.
+
+Στο Codemagic (App settings → Webhooks) βάλε το δημόσιο URL του listener,
+π.χ. μέσω tunnel:  https://<tunnel>/codemagic?token=<secret>
+
+Ο listener ακούει μόνο στο 127.0.0.1 (το tunnel συνδέεται τοπικά). Σε άλλη
+διεύθυνση ξεκινάει μόνο με secret. Τα payloads δεν θεωρούνται αξιόπιστα:
+απλώς ξυπνάνε όποιον περιμένει, τα στοιχεία του build έρχονται από το API.
+
+Offline δοκιμή με αποθηκευμένα payloads:
+    python codemagic_webhook.py listen --port 8765
+    python codemagic_webhook.py replay payload.json --url http://127.0.0.1:8765/codemagic
+"""
+
+import argparse
+import hmac
+import ipaddress
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+WEBHOOK_PATH = "/codemagic"
+
+# Μέγιστο μέγεθος payload που δεχόμαστε: το event είναι μόνο σήμα αφύπνισης,
+# δεν χρειάζεται ολόκληρο το build
+MAX_PAYLOAD = 64 * 1024
+
+
+def is_loopback(host):
+    """True αν το host είναι τοπική (loopback) διεύθυνση"""
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+def build_event(payload):
+    """(build_id, build data) από ένα webhook payload, ή (None, None)"""
+    build = payload.get("build", payload) if isinstance(payload, dict) else None
+    if not isinstance(build, dict):
+        return None, None
+    build_id = build.get("_id") or build.get("id") or build.get("buildId")
+    return build_id, build
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "CodemagicWebhook/1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _reply(self, code, message):
+        body = message.encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "text/plain; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        receiver = self.server.receiver
+        url = urlparse(self.path)
+        if url.path != receiver.path:
+            return self._reply(404, "not found")
+        if receiver.secret is not None:
+            token = parse_qs(url.query).get("token", [""])[0]
+            if not hmac.compare_digest(token, receiver.secret):
+                return self._reply(403, "forbidden")
+
+        length = self.headers.get("Content-Length") or "0"
+        if not length.isdigit():
+            return self._reply(400, "invalid content-length")
+        length = int(length)
+        if length > MAX_PAYLOAD:
+            return self._reply(413, "payload too large")
+        try:
+            payload = json.loads(self.rfile.read(length) or b"null")
+        except ValueError:
+            return self._reply(400, "invalid json")
+
+        build_id, build = build_event(payload)
+        if build_id is None:
+            return self._reply(400, "no build in payload")
+        receiver.deliver(build_id, build)
+        self._reply(200, "ok")
+
+
+class WebhookReceiver:
+    """HTTP listener σε background thread που κρατάει το τελευταίο event ανά build"""
+
+    def __init__(self, host=DEFAULT_HOST, port=DEFAULT_PORT, path=WEBHOOK_PATH, secret=None):
+        if not secret and not is_loopback(host):
+            raise ValueError(f"Ο webhook listener στο {host} χρειάζεται secret (CODEMAGIC_WEBHOOK_SECRET)")
+        self.path = path
+        self.secret = secret
+        self._builds = {}
+        self._versions = {}
+        self._changed = threading.Condition()
+
+        self.server = ThreadingHTTPServer((host, port), _Handler)
+        self.server.daemon_threads = True
+        self.server.receiver = self
+        self.port = self.server.server_address[1]
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def start(self):
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def deliver(self, build_id, build):
+        """Καταχωρεί ένα event και ξυπνάει όσους περιμένουν"""
+        with self._changed:
+            self._builds[build_id] = build
+            self._versions[build_id] = self._versions.get(build_id, 0) + 1
+            self._changed.notify_all()
+
+    def version(self, build_id):
+        """Πόσα events έχουν έρθει για το build"""
+        with self._changed:
+            return self._versions.get(build_id, 0)
+
+    def wait(self, build_id, after_version, timeout):
+        """Περιμένει event νεότερο από after_version: (build data, version),
+        ή (None, after_version) αν περάσει το timeout"""
+        deadline = time.monotonic() + timeout
+        with self._changed:
+            while self._versions.get(build_id, 0) <= after_version:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None, after_version
+                self._changed.wait(remaining)
+            return self._builds[build_id], self._versions[build_id]
+
+    def changes(self, seen, timeout=None):
+        """(build_id, build data) όσων builds άλλαξαν από το seen (dict
+        build_id → version, ενημερώνεται), περιμένοντας μέχρι timeout"""
+        with self._changed:
+            self._changed.wait_for(lambda: any(seen.get(build_id) != version
+                                               for build_id, version in self._versions.items()), timeout)
+            updates = [(build_id, self._builds[build_id]) for build_id, version in self._versions.items()
+                       if seen.get(build_id) != version]
+            seen.update(self._versions)
+        return updates
+
+
+def replay(url, payloads, delay=0.0):
+    """Στέλνει αποθηκευμένα payloads στον listener (offline δοκιμές)"""
+    import requests
+    for payload in payloads:
+        response = requests.post(url, json=payload, timeout=10)
+        build_id, build = build_event(payload)
+        print(f"   → {build_id}: {build.get('status') if build else '?'} (HTTP {response.status_code})")
+        time.sleep(delay)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Codemagic webhook listener και replay για offline δοκιμές")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    listen = commands.add_parser("listen", help="τύπωνε τα events που φτάνουν")
+    listen.add_argument("--host", default=DEFAULT_HOST, help="εκτός loopback απαιτεί --secret")
+    listen.add_argument("--port", type=int, default=DEFAULT_PORT)
+    listen.add_argument("--secret", help="απαιτούμενο ?token= στο URL")
+
+    send = commands.add_parser("replay", help="στείλε payloads από JSON αρχεία")
+    send.add_argument("files", nargs="+", help="JSON αρχεία με ένα payload ή λίστα από payloads")
+    send.add_argument("--url", default=f"http://127.0.0.1:{DEFAULT_PORT}{WEBHOOK_PATH}")
+    send.add_argument("--delay", type=float, default=0.0, help="δευτερόλεπτα ανάμεσα στα payloads")
+    args = parser.parse_args()
+
+    if args.command == "replay":
+        payloads = []
+        for path in args.files:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            payloads += data if isinstance(data, list) else [data]
+        replay(args.url, payloads, args.delay)
+        return
+
+    with WebhookReceiver(args.host, args.port, secret=args.secret) as receiver:
+        print(f"👂 Webhooks στο http://{args.host}:{receiver.port}{receiver.path} (Ctrl+C για έξοδο)")
+        seen = {}
+        try:
+            while True:
+                for build_id, build in receiver.changes(seen, timeout=1.0):
+                    print(f"   {build_id}: {build.get('status')}")
+        except KeyboardInterrupt:
+            print("\nΤέλος")
+
+
+if __name__ == "__main__":
+    main()
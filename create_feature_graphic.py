@@ -1,146 +1,253 @@
 #!/usr/bin/env python3
 """
 Script to create Play Store Feature Graphic (1024x500) for GetFit
+
+The graphic is a template: the static layers (gradient, logo and
+decorations) are rendered once per logo and only the text and badge are
+drawn per variant. The locale and promo variants are declared in assets.manifest.json
+("feature_graphic").
+
+Pillow is only imported once a graphic is rendered, so --plan/--dry-run
+works without it.
 """
 
-try:
-    from PIL import Image, ImageDraw, ImageFont
-    import os
-except ImportError:
-    print("Installing required package: Pillow")
-    import subprocess
-    subprocess.check_call(["pip", "install", "Pillow"])
-    from PIL import Image, ImageDraw, ImageFont
-    import os
-
-def create_feature_graphic(logo_path, output_path):
-    """Create a 1024x500 Feature Graphic for Play Store"""
-    
-    print(f"Creating Feature Graphic from: {logo_path}")
-    
-    # Check if logo exists
-    if not os.path.exists(logo_path):
-        print(f"Error: Logo not found at {logo_path}")
-        return False
+import argparse
+import os
+import time
+
+from asset_build import atomic_write
+from asset_engine import load_manifest
+from asset_trace import PROFILE_PATH, collect, profiled, span
+from asset_trace import report as report_trace
+
+# Play Store Feature Graphic size
+GRAPHIC_SIZE = (1024, 500)
+
+# Fonts shared by every variant, loaded on first use
+_fonts = {}
+
+
+def load_fonts():
+    """Title, subtitle and feature fonts (loaded once per process)"""
+    if not _fonts:
+        from PIL import ImageFont
+        # Use default font (one instance serves every role)
+        font = ImageFont.load_default()
+        _fonts.update(title=font, subtitle=font, feature=font)
+    return _fonts
+
+
+class FeatureGraphicTemplate:
+    """Static layers of the Feature Graphic, rendered once per logo"""
     
-    try:
-        # Create canvas 1024x500
-        width, height = 1024, 500
-        graphic = Image.new('RGB', (width, height), '#1a1a1a')  # Dark background
-        draw = ImageDraw.Draw(graphic)
-        
-        # Create gradient background
-        for y in range(height):
-            # Create gradient from dark to slightly lighter
-            color_value = int(26 + (y / height) * 30)  # 26 to 56
-            color = (color_value, color_value, color_value)
-            draw.line([(0, y), (width, y)], fill=color)
-        
-        # Load and resize logo
-        logo = Image.open(logo_path).convert('RGBA')
+    def __init__(self, logo_path, size=GRAPHIC_SIZE):
+        from asset_master import load_master
+        self.logo_path = logo_path
+        self.width, self.height = size
+        self._base = None
         
         # Calculate logo size (height should be about 40% of canvas height)
-        logo_height = int(height * 0.4)
-        logo_width = int(logo_height * (logo.width / logo.height))
+        master = load_master(logo_path)
+        self.logo_height = int(self.height * 0.4)
+        self.logo_width = int(self.logo_height * master.ratio)
         
-        # Resize logo
-        logo = logo.resize((logo_width, logo_height), Image.Resampling.LANCZOS)
+        # Position logo on the left side, text to its right
+        self.logo_x = 50
+        self.logo_y = (self.height - self.logo_height) // 2
+        self.text_x = self.logo_x + self.logo_width + 40
         
-        # Position logo on the left side
-        logo_x = 50
-        logo_y = (height - logo_height) // 2
+        # "ΔΩΡΕΑΝ" badge box
+        self.badge_x = self.width - 120
+        self.badge_y = 30
+    
+    def base(self):
+        """Gradient, logo and decorations (cached, do not modify)"""
+        if self._base is None:
+            self._base = self._render_base()
+        return self._base
+    
+    def _render_base(self):
+        from PIL import ImageDraw
+        from asset_graphics import alpha_over, vertical_gradient
+        from asset_master import load_master
+        width, height = self.width, self.height
         
-        # Paste logo
-        graphic.paste(logo, (logo_x, logo_y), logo)
+        # Create gradient background from dark (#1a1a1a) to slightly lighter
+        graphic = vertical_gradient((width, height), (26, 26, 26), (56, 56, 56))
+        draw = ImageDraw.Draw(graphic)
         
-        # Add text content
-        text_x = logo_x + logo_width + 40
+        # Resize and paste logo (shared master, decoded once per run)
+        logo = load_master(self.logo_path).resize((self.logo_width, self.logo_height))
+        alpha_over(graphic, logo, (self.logo_x, self.logo_y))
         
-        # Try to load a font, fallback to default if not available
-        try:
-            # Try different font sizes
-            title_font_size = 48
-            subtitle_font_size = 24
-            feature_font_size = 18
-            
-            # Use default font
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            feature_font = ImageFont.load_default()
-            
-        except:
-            title_font = ImageFont.load_default()
-            subtitle_font = ImageFont.load_default()
-            feature_font = ImageFont.load_default()
+        # Add decorative elements
+        # Small circles for decoration
+        for i in range(5):
+            circle_x = width - 60 - (i * 15)
+            circle_y = height - 60
+            draw.ellipse([circle_x, circle_y, circle_x + 8, circle_y + 8], fill='#00C08B', outline='#FFFFFF', width=1)
+        
+        return graphic
+    
+    def render(self, variant):
+        """Feature Graphic for one variant: its texts and badge drawn over the
+        cached base"""
+        with span("copy", self.width * self.height):
+            graphic = self.base().copy()
+        with span("text"):
+            self._draw_text(graphic, variant)
+        return graphic
+    
+    def _draw_text(self, graphic, variant):
+        from PIL import ImageDraw
+        draw = ImageDraw.Draw(graphic)
+        fonts = load_fonts()
+        text_x = self.text_x
         
         # Main title
-        title_text = "GetFit"
         title_color = '#00C08B'  # Teal color
-        draw.text((text_x, 80), title_text, font=title_font, fill=title_color)
+        draw.text((text_x, 80), variant["title"], font=fonts["title"], fill=title_color)
         
         # Subtitle
-        subtitle_text = "Σύστημα Διαχείρισης Γυμναστηρίου"
         subtitle_color = '#FFFFFF'
-        draw.text((text_x, 130), subtitle_text, font=subtitle_font, fill=subtitle_color)
+        draw.text((text_x, 130), variant["subtitle"], font=fonts["subtitle"], fill=subtitle_color)
         
         # Features
-        features = [
-            "• QR Code Είσοδος",
-            "• Ημερολόγιο Προπονήσεων", 
-            "• Διαχείριση Συνδρομών",
-            "• Ειδοποιήσεις"
-        ]
-        
         feature_y = 180
-        for feature in features:
-            draw.text((text_x, feature_y), feature, font=feature_font, fill='#CCCCCC')
+        for feature in variant["features"]:
+            draw.text((text_x, feature_y), feature, font=fonts["feature"], fill='#CCCCCC')
             feature_y += 35
         
-        # Add "ΔΩΡΕΑΝ" badge
-        badge_x = width - 120
-        badge_y = 30
-        badge_width = 100
-        badge_height = 40
-        
-        # Draw badge background
-        draw.rounded_rectangle(
-            [badge_x, badge_y, badge_x + badge_width, badge_y + badge_height],
-            radius=8,
-            fill='#FF6B35'
-        )
-        
-        # Badge text
-        draw.text((badge_x + 20, badge_y + 10), "ΔΩΡΕΑΝ", font=title_font, fill='#FFFFFF')
-        
-        # Add decorative elements
-        # Small circles for decoration
-        for i in range(5):
-            circle_x = width - 60 - (i * 15)
-            circle_y = height - 60
-            draw.ellipse([circle_x, circle_y, circle_x + 8, circle_y + 8], fill='#00C08B', outline='#FFFFFF', width=1)
-        
-        # Save the graphic
-        graphic.save(output_path, 'PNG', quality=95)
-        print(f"Created Feature Graphic: {output_path}")
-        
-        # Show file info
-        file_size = os.path.getsize(output_path)
-        print(f"Size: {width}x{height} pixels")
-        print(f"File size: {file_size / 1024:.1f} KB")
-        
-        return True
+        # Badge, only for variants that have one
+        if variant.get("badge"):
+            badge_width = 100
+            badge_height = 40
+            draw.rounded_rectangle(
+                [self.badge_x, self.badge_y, self.badge_x + badge_width, self.badge_y + badge_height],
+                radius=8,
+                fill='#FF6B35'
+            )
+            draw.text((self.badge_x + 20, self.badge_y + 10), variant["badge"], font=fonts["title"], fill='#FFFFFF')
+
+
+def load_variants(manifest=None):
+    """Feature Graphic settings and variants from assets.manifest.json"""
+    manifest = manifest or load_manifest()
+    return manifest["feature_graphic"]
+
+
+def stream_feature_graphics(logo_path, variants, encoded=True):
+    """Yield (name, variant, data, metrics) per variant as it is rendered,
+    without writing anything; data is the lossless PNG encoding, or the
+    image itself with encoded False. The first item's spans include the
+    shared base layers."""
+    from asset_encode import encode_png
+    collect()
+    template = FeatureGraphicTemplate(logo_path)
+    template.base()
+    for name, variant in variants.items():
+        start = time.perf_counter()
+        graphic = template.render(variant)
+        if encoded:
+            # Lossless, smallest PNG encoding
+            data, _, _ = encode_png(graphic, ["png", "png-max"])
+            metrics = {"bytes": len(data)}
+        else:
+            data, metrics = graphic, {}
+        metrics.update(seconds=time.perf_counter() - start, size=(template.width, template.height),
+                       spans=collect())
+        yield name, variant, data, metrics
+
+
+def build_feature_graphics(logo_path, output_dir, variants, tolerance=0):
+    """Render and write every variant as one worker target (see
+    asset_batch); returns a result dict like asset_render.build_node"""
+    from asset_render import write_output
+    result = {"bytes": 0, "changes": {}, "spans": []}
+    for name, variant, data, metrics in stream_feature_graphics(logo_path, variants):
+        output_path = os.path.join(output_dir, variant["output"])
+        result["changes"][output_path] = write_output(data, output_path, tolerance)
+        result["bytes"] += len(data)
+        result["spans"] += metrics["spans"] + collect()
+    return result
+
+
+def create_feature_graphics(logo_path, output_dir, variants):
+    """Render every variant from one template; returns the written paths"""
+    
+    print(f"Creating Feature Graphic from: {logo_path}")
+    
+    # Check if logo exists
+    if not os.path.exists(logo_path):
+        print(f"Error: Logo not found at {logo_path}")
+        return []
+    
+    try:
+        written = []
+        traced = []
+        for name, variant, data, metrics in stream_feature_graphics(logo_path, variants):
+            # Save the graphic
+            output_path = os.path.join(output_dir, variant["output"])
+            with span("write", bytes=len(data)) as record:
+                atomic_write(data, output_path)
+            traced.append((output_path, metrics["spans"] + collect()))
+            
+            elapsed = (metrics["seconds"] + record["ms"] / 1000) * 1000
+            print(f"Created Feature Graphic [{name}]: {output_path} ({len(data) / 1024:.1f} KB, {elapsed:.1f} ms)")
+            written.append(output_path)
         
+        if written:
+            print(f"Size: {metrics['size'][0]}x{metrics['size'][1]} pixels")
+        report_trace(traced)
+        return written
+    
     except Exception as e:
         print(f"Error creating feature graphic: {e}")
-        return False
+        return []
+
+def print_plan(logo_path, output_dir, variants):
+    """List every variant and its output path without rendering anything"""
+    width, height = GRAPHIC_SIZE
+    counts = {}
+    print(f"Logo: {logo_path}")
+    for name, variant in variants.items():
+        output_path = os.path.join(output_dir, variant["output"])
+        status = "exists" if os.path.exists(output_path) else "missing"
+        counts[status] = counts.get(status, 0) + 1
+        print(f"  {status:10}  {width:>4}x{height:<4}  [{name}] {output_path}")
+    print("\n" + ", ".join(f"{count} {status}" for status, count in sorted(counts.items())))
+
+def create_feature_graphic(logo_path, output_path, variant=None):
+    """Create a 1024x500 Feature Graphic for Play Store"""
+    variants = load_variants()["variants"]
+    variant = dict(variant or variants["el"], output=os.path.basename(output_path))
+    return bool(create_feature_graphics(logo_path, os.path.dirname(output_path) or '.', {"el": variant}))
 
 def main():
+    parser = argparse.ArgumentParser(description="Create the Play Store Feature Graphic variants")
+    parser.add_argument("--variant", action="append", dest="variants",
+                        help="only render this variant (repeatable, default: all)")
+    parser.add_argument("--profile", nargs="?", const=PROFILE_PATH, metavar="FILE",
+                        help=f"run under cProfile and write the stats (default: {PROFILE_PATH})")
+    parser.add_argument("--plan", "--dry-run", dest="dry_run", action="store_true",
+                        help="list the variants and their output paths without rendering")
+    args = parser.parse_args()
+    
     print("Creating Play Store Feature Graphic for GetFit\n")
     
+    settings = load_variants()
+    variants = settings["variants"]
+    if args.variants:
+        unknown = [name for name in args.variants if name not in variants]
+        if unknown:
+            print(f"Unknown variant(s): {', '.join(unknown)} (available: {', '.join(variants)})")
+            return
+        variants = {name: variants[name] for name in args.variants}
+    
     # Try different logo files - prioritizing logoapp.png
     logo_candidates = [
         "public/logoapp.png",
-        "public/logo2.png", 
+        "public/logo2.png",
         "public/logo.png"
     ]
     
@@ -156,23 +263,27 @@ def main():
             print(f"   - {candidate}")
         return
     
+    output_dir = settings["output_dir"]
+    if args.dry_run:
+        print_plan(logo_path, output_dir, variants)
+        return
+    
     print(f"Using logo: {logo_path}")
     
     # Create output directory
-    output_dir = "playstore-assets/graphics"
     os.makedirs(output_dir, exist_ok=True)
     
-    # Create Feature Graphic
-    output_path = os.path.join(output_dir, "feature-graphic-1024x500.png")
-    success = create_feature_graphic(logo_path, output_path)
+    # Create Feature Graphics
+    with profiled(args.profile):
+        written = create_feature_graphics(logo_path, output_dir, variants)
     
-    if success:
+    if written:
         print("\nSUCCESS!")
-        print(f"Your Feature Graphic is ready: {output_path}")
+        print(f"Your Feature Graphics are ready: {', '.join(written)}")
         print("\nNext steps:")
         print("1. Go to Google Play Console")
-        print("2. Navigate to Store listing > Feature Graphic")
-        print(f"3. Upload the file: {output_path}")
+        print("2. Navigate to Store listing > Feature Graphic (per language)")
+        print("3. Upload the file for each listing language")
         print("4. The graphic should be 1024x500 pixels, PNG format")
         print("\nYour app will look great on the Play Store!")
     else:
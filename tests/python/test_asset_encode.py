@@ -0,0 +1,86 @@
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from asset_encode import PNGStreamWriter, encode_png_rows, filter_rows, pixels_match
+
+
+def png(image, **params):
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG', **params)
+    return buffer.getvalue()
+
+
+def sample(mode, size=(37, 29), seed=1):
+    """Banded random pixels: compressible, but every PNG filter gets used"""
+    rng = np.random.default_rng(seed)
+    channels = {'RGB': 3, 'RGBA': 4}.get(mode, 1)
+    pixels = (rng.integers(0, 256, (size[1], size[0], channels)) // 40 * 40).astype(np.uint8)
+    if mode == 'P':
+        image = Image.fromarray(pixels[..., 0], 'P')
+        image.putpalette(list(range(256)) * 3)
+        return image
+    return Image.fromarray(pixels, mode)
+
+
+def test_pixels_match_identical_bytes():
+    data = png(sample('RGB'))
+    assert pixels_match(data, data)
+
+
+def test_pixels_match_ignores_encoding():
+    image = sample('RGB')
+    assert pixels_match(png(image), png(image, optimize=True, compress_level=9), rows=4)
+
+
+def test_pixels_match_ignores_color_under_full_transparency():
+    first = Image.new('RGBA', (8, 8), (255, 0, 0, 0))
+    second = Image.new('RGBA', (8, 8), (0, 0, 255, 0))
+    assert pixels_match(png(first), png(second))
+
+
+def test_pixels_match_tolerance_in_a_later_band():
+    image = sample('RGB', (16, 40))
+    changed = image.copy()
+    r, g, b = changed.getpixel((3, 35))
+    changed.putpixel((3, 35), (r ^ 2, g, b))
+    assert not pixels_match(png(image), png(changed), rows=8)
+    assert pixels_match(png(image), png(changed), tolerance=2, rows=8)
+
+
+def test_pixels_match_size_and_unreadable_data():
+    data = png(sample('RGB'))
+    assert not pixels_match(data, png(sample('RGB', (29, 37))))
+    assert not pixels_match(data, b"not a png")
+
+
+@pytest.mark.parametrize("mode", ['RGB', 'RGBA', 'P'])
+def test_stream_writer_round_trip(mode):
+    image = sample(mode)
+    raw = image.tobytes()
+    row_bytes = len(raw) // image.height
+    # Bands of uneven height, as the strip renderer's last band is
+    bands = [raw[top * row_bytes:(top + 5) * row_bytes] for top in range(0, image.height, 5)]
+    palette = image.getpalette() if mode == 'P' else None
+
+    decoded = Image.open(io.BytesIO(encode_png_rows(image.size, mode, bands, palette)))
+    assert decoded.mode == mode
+    assert decoded.size == image.size
+    assert decoded.tobytes() == raw
+
+
+def test_stream_writer_rejects_missing_rows():
+    writer = PNGStreamWriter(io.BytesIO(), (4, 3), 'RGB')
+    writer.write_rows(bytes(4 * 3 * 2))
+    with pytest.raises(ValueError):
+        writer.close()
+
+
+def test_filter_rows_picks_up_for_repeated_rows():
+    row = np.arange(0, 240, 10, dtype=np.uint8)
+    rows = np.tile(row, (3, 1))
+    lines = np.frombuffer(filter_rows(rows, row, 3), dtype=np.uint8).reshape(3, -1)
+    assert list(lines[:, 0]) == [2, 2, 2]
+    assert not lines[:, 1:].any()
@@ -0,0 +1,57 @@
+import requests
+
+from codemagic_download import MIN_SEGMENT, SPLIT_THRESHOLD, Artifact, range_start
+
+URL = "https://storage.example.com/builds/app.ipa"
+
+
+def planned(tmp_path, size, workers=4, split=True):
+    artifact = Artifact({"name": "app.ipa", "url": URL, "size": size}, tmp_path)
+    return artifact.plan(workers, split)
+
+
+def test_small_artifact_is_one_segment(tmp_path):
+    [segment] = planned(tmp_path, 1000)
+    assert (segment.start, segment.end, segment.length) == (0, 999, 1000)
+
+
+def test_unknown_size_is_one_open_segment(tmp_path):
+    [segment] = planned(tmp_path, None)
+    assert (segment.start, segment.end, segment.length) == (0, None, None)
+
+
+def test_large_artifact_segments_cover_every_byte_once(tmp_path):
+    size = SPLIT_THRESHOLD * 2 + 12345
+    segments = planned(tmp_path, size)
+    assert len(segments) == 4
+    assert segments[0].start == 0
+    assert segments[-1].end == size - 1
+    for previous, segment in zip(segments, segments[1:]):
+        assert segment.start == previous.end + 1
+    assert sum(segment.length for segment in segments) == size
+    assert len({segment.path for segment in segments}) == 4
+
+
+def test_segment_count_limited_by_min_segment(tmp_path):
+    segments = planned(tmp_path, SPLIT_THRESHOLD, workers=64)
+    assert len(segments) == SPLIT_THRESHOLD // MIN_SEGMENT
+
+
+def test_no_split_when_asked(tmp_path):
+    [segment] = planned(tmp_path, SPLIT_THRESHOLD * 2, split=False)
+    assert segment.length == SPLIT_THRESHOLD * 2
+
+
+def response(content_range=None):
+    result = requests.Response()
+    if content_range is not None:
+        result.headers["Content-Range"] = content_range
+    return result
+
+
+def test_range_start():
+    assert range_start(response("bytes 1000-1999/5000")) == 1000
+    assert range_start(response("bytes 0-99/*")) == 0
+    assert range_start(response("bytes */5000")) is None
+    assert range_start(response("items 5-9/10")) is None
+    assert range_start(response()) is None
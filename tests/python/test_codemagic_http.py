@@ -0,0 +1,47 @@
+import requests
+
+from codemagic_http import API_URL, CodemagicHTTP, _Session
+
+
+def redirect(location, url=API_URL + "/artifacts/1"):
+    """Prepared follow-up request of a redirect from url to location"""
+    original = requests.Request("GET", url, headers={"x-auth-token": "secret"}).prepare()
+    response = requests.Response()
+    response.request = original
+    follow = original.copy()
+    follow.prepare_url(location, None)
+    _Session().rebuild_auth(follow, response)
+    return follow
+
+
+def test_redirect_to_another_host_drops_the_token():
+    assert "x-auth-token" not in redirect("https://storage.example.com/app.ipa").headers
+
+
+def test_redirect_to_another_scheme_or_port_drops_the_token():
+    assert "x-auth-token" not in redirect("http://api.codemagic.io/artifacts/1").headers
+    assert "x-auth-token" not in redirect("https://api.codemagic.io:8443/artifacts/1").headers
+
+
+def test_redirect_within_the_api_keeps_the_token():
+    assert redirect(API_URL + "/artifacts/2").headers["x-auth-token"] == "secret"
+
+
+def test_token_only_sent_to_the_exact_api_origin(monkeypatch):
+    http = CodemagicHTTP("secret")
+    sent = {}
+
+    def request(method, url, **kwargs):
+        sent[url] = kwargs.get("headers", {})
+        result = requests.Response()
+        result.status_code = 200
+        return result
+
+    monkeypatch.setattr(http.session, "request", request)
+    for url in ("/apps", "https://api.codemagic.io.example.com/x", "https://storage.example.com/app.ipa"):
+        http.get(url)
+
+    assert sent[API_URL + "/apps"]["x-auth-token"] == "secret"
+    assert "x-auth-token" not in sent["https://api.codemagic.io.example.com/x"]
+    assert "x-auth-token" not in sent["https://storage.example.com/app.ipa"]
+    assert http.stats["requests"] == 3
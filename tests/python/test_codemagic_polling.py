@@ -0,0 +1,41 @@
+import pytest
+
+from codemagic_polling import (FALLBACK_INTERVAL, MAX_INTERVAL, MIN_INTERVAL, OVERDUE_FRACTION,
+                               REMAINING_FRACTION, BuildHistory, format_eta, poll_interval)
+
+
+def test_interval_is_a_fraction_of_the_remaining_time():
+    assert poll_interval(0, 200) == pytest.approx(200 * REMAINING_FRACTION)
+
+
+def test_interval_stays_within_limits():
+    assert poll_interval(0, 100000) == MAX_INTERVAL
+    assert poll_interval(995, 1000) == MIN_INTERVAL
+
+
+def test_guessed_estimate_polls_no_slower_than_the_fallback():
+    assert poll_interval(0, 100000, known=False) == FALLBACK_INTERVAL
+
+
+def test_overdue_build_backs_off_slowly_up_to_the_fallback():
+    assert poll_interval(1000, 1000) == MIN_INTERVAL
+    assert poll_interval(1100, 1000) == pytest.approx(MIN_INTERVAL + 100 * OVERDUE_FRACTION)
+    assert poll_interval(100000, 1000) == FALLBACK_INTERVAL
+
+
+def test_format_eta():
+    assert format_eta(0, 12 * 60).endswith("(~12 λεπτά)")
+    assert format_eta(0, 10).endswith("(~1 λεπτά)")
+    assert format_eta(10 * 60, 5 * 60) == "+5 λεπτά πάνω από την εκτίμηση"
+
+
+def test_history_estimate_and_known(tmp_path):
+    history = BuildHistory(str(tmp_path / "history.json"))
+    assert not history.known("ios", "main")
+    for seconds in (600, 900, 700):
+        history.record("ios", "main", seconds)
+    assert history.estimate("ios", "main") == 700
+    # Another branch falls back to the workflow's history
+    assert history.known("ios", "develop")
+    assert history.estimate("ios", "develop") == 700
+    assert BuildHistory(str(tmp_path / "history.json")).estimate("ios", "main") == 700
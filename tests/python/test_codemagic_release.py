@@ -0,0 +1,8 @@
+from codemagic_release import DEFAULT_BRANCH, parse_target
+
+
+def test_parse_target():
+    assert parse_target("ios-production") == ("ios-production", DEFAULT_BRANCH)
+    assert parse_target("android-release:develop") == ("android-release", "develop")
+    assert parse_target("ios:feature/login") == ("ios", "feature/login")
+    assert parse_target("ios:") == ("ios", DEFAULT_BRANCH)